@@ -0,0 +1,477 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from company_registry import REGISTRY_PATH, CompanyRegistry
+from contact_export import EXCEL_COLUMNS, write_csv
+from contact_record import ContactRecord
+from contact_store import ContactStore
+from main import ProfessionalEmailGenerator
+from name_normalizer import normalize_name
+
+FIRST_NAMES = [
+    "Jean", "Marie", "Pierre", "Étienne", "Anne-Sophie", "François", "Chloé", "Hélène", "Louis", "Zoé",
+    "Jean-Baptiste", "Amélie", "Benoît", "Cécile", "Gaëlle", "Jérôme", "Léa", "Maël", "Noémie", "Raphaël",
+    "Sébastien", "Thaïs", "Valérie", "Yaëlle", "Agnès", "Clémence", "Océane", "Loïc", "Inès", "Aurélien",
+]
+LAST_NAMES = [
+    "Dupont", "Martin", "Dubois", "Le Gall", "De La Tour", "Lefèvre", "O'Neil", "Müller", "Roux", "Girard",
+    "Bérénger", "Château", "Crémieux", "D'Aubigné", "Delacroix", "Fontaine", "Garçon", "Lemaître", "Mercier",
+    "Pétain", "Rousseau", "Saint-Exupéry", "Thibault", "Vallée", "Le Bihan", "Van der Berg", "Bâtard", "Noël",
+    "Hébert", "Moreau",
+]
+
+# Share of last names made compound ("Dupont-Moretti") in synthetic data
+COMPOUND_SHARE = 0.25
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# Queries timed by the search case: common substrings, rare ones and misses
+SEARCH_QUERIES = ["dupont", "le gall", "gs.com", "Goldman", "éti", "ma", "zz", "saint-exupéry", "nobody", "kpmg"]
+
+# Relative change beyond which compare flags a result
+DEFAULT_THRESHOLD = 0.10
+
+
+def make_contacts(generator, rows, seed=42, unknown_share=0.0):
+    """Build a deterministic synthetic prospect list
+
+    Names are French, accented, and a quarter of the last names are
+    compound; companies cycle through every registered company (plus
+    "Unknown Corp" for unknown_share of the rows).
+    """
+    rng = np.random.default_rng(seed)
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=rows)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=rows)]
+    second = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=rows)]
+    compound = rng.random(rows) < COMPOUND_SHARE
+    last[compound] = last[compound] + '-' + second[compound]
+
+    companies = np.array(list(generator.company_formats), dtype=object)
+    company = companies[rng.permutation(rows) % len(companies)]
+    company[rng.random(rows) < unknown_share] = "Unknown Corp"
+
+    return pd.DataFrame({
+        'first_name': first,
+        'last_name': last,
+        'company': company,
+        'position': np.array(["Analyst", "Associate", "VP", "Director"], dtype=object)[rng.integers(4, size=rows)],
+        'source': np.array(["LinkedIn", "Referral", "Event", ""], dtype=object)[rng.integers(4, size=rows)],
+        'language': np.array(["fr", "en"], dtype=object)[rng.integers(2, size=rows)],
+    })
+
+
+def make_store(generator, df):
+    """ContactStore holding df's contacts, built without going through add_contact"""
+    emails, _ = generator.generate_emails(df)
+    contacts = pd.DataFrame({
+        'name': df['first_name'] + ' ' + df['last_name'],
+        'email': emails,
+        'company': df['company'],
+        'position': df['position'],
+        'source': df['source'],
+        'language': df['language'],
+        'custom_message': '',
+        'date_added': '2024-01-01 09:00:00',
+    })
+    return ContactStore(contacts.to_dict('records'))
+
+
+def generate_loop(generator, df):
+    """Reference implementation: one generate_email call per row"""
+    emails = []
+    for first, last, company in zip(df['first_name'], df['last_name'], df['company']):
+        try:
+            emails.append(generator.generate_email(first, last, company))
+        except ValueError:
+            emails.append(None)
+    return emails
+
+
+# Each case takes (df, workdir) and returns (setup, run, units): setup()
+# prepares untimed state, run(state) is the timed operation and units is
+# the count behind the throughput (rows, or queries for search).
+
+def case_clean_name(df, workdir):
+    names = df['last_name'].tolist()
+
+    def setup():
+        normalize_name.cache_clear()
+        return ProfessionalEmailGenerator()
+
+    def run(generator):
+        for name in names:
+            generator.clean_name(name)
+    return setup, run, len(names)
+
+
+def case_generate_email(df, workdir):
+    def run(generator):
+        generate_loop(generator, df)
+    return ProfessionalEmailGenerator, run, len(df)
+
+
+def case_generate_emails(df, workdir):
+    def run(generator):
+        generator.generate_emails(df)
+    return ProfessionalEmailGenerator, run, len(df)
+
+
+def case_add_contact(df, workdir):
+    rows = list(zip(df['first_name'], df['last_name'], df['company'], df['position'], df['source'], df['language']))
+
+    def run(generator):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for row in rows:
+                generator.add_contact(*row)
+    return ProfessionalEmailGenerator, run, len(rows)
+
+
+def case_search_contacts(df, workdir):
+    def setup():
+        generator = ProfessionalEmailGenerator()
+        generator.contacts = make_store(generator, df)
+        return generator
+
+    def run(generator):
+        for query in SEARCH_QUERIES:
+            generator.search_contacts(query)
+    return setup, run, len(SEARCH_QUERIES)
+
+
+def case_export_to_excel(df, workdir):
+    path = os.path.join(workdir, f"export_{len(df)}.xlsx")
+
+    def setup():
+        generator = ProfessionalEmailGenerator()
+        generator.contacts = make_store(generator, df)
+        return generator
+
+    def run(generator):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.export_to_excel(path)
+    return setup, run, len(df)
+
+
+def case_load_from_excel(df, workdir):
+    path = os.path.join(workdir, f"load_{len(df)}.xlsx")
+
+    def setup():
+        if not os.path.exists(path):
+            generator = ProfessionalEmailGenerator()
+            generator.contacts = make_store(generator, df)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.export_to_excel(path)
+        return ProfessionalEmailGenerator()
+
+    def run(generator):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.load_from_excel(path)
+    return setup, run, len(df)
+
+
+CASES = {
+    'clean_name': case_clean_name,
+    'generate_email': case_generate_email,
+    'generate_emails': case_generate_emails,
+    'add_contact': case_add_contact,
+    'search_contacts': case_search_contacts,
+    'export_to_excel': case_export_to_excel,
+    'load_from_excel': case_load_from_excel,
+}
+
+
+def measure(case, df, workdir, memory=True):
+    """Time one case (untraced), then re-run it under tracemalloc for its peak memory"""
+    setup, run, units = CASES[case](df, workdir)
+
+    state = setup()
+    start = time.perf_counter()
+    run(state)
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        state = setup()
+        tracemalloc.start()
+        try:
+            run(state)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'case': case,
+        'rows': len(df),
+        'units': units,
+        'seconds': seconds,
+        'throughput': units / seconds if seconds else None,
+        'peak_mb': peak_mb,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, cases=tuple(CASES), seed=42, memory=True, progress=print):
+    """Run every case at every size; returns the JSON-ready results document"""
+    results = []
+    generator = ProfessionalEmailGenerator()
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            df = make_contacts(generator, rows, seed)
+            for case in cases:
+                result = measure(case, df, workdir, memory)
+                results.append(result)
+                if progress is not None:
+                    memory_text = f"{result['peak_mb']:9.1f} MB" if result['peak_mb'] is not None else ''
+                    progress(f"   {case:16s} {rows:>10,} rows  {result['seconds']:9.3f}s  "
+                             f"{result['throughput']:14,.0f}/s  {memory_text}")
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare_runs(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Rows comparing two result documents; a row regresses when throughput drops
+    or peak memory grows by more than threshold (relative)"""
+    before = {(r['case'], r['rows']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = before.get((result['case'], result['rows']))
+        if base is None:
+            continue
+        speed = result['throughput'] / base['throughput'] - 1 if base['throughput'] else 0.0
+        memory = None
+        if base.get('peak_mb') and result.get('peak_mb') is not None:
+            memory = result['peak_mb'] / base['peak_mb'] - 1
+        rows.append({
+            'case': result['case'],
+            'rows': result['rows'],
+            'throughput_change': speed,
+            'memory_change': memory,
+            'regression': speed < -threshold or (memory is not None and memory > threshold),
+        })
+    return rows
+
+
+def bench_generate_emails(rows):
+    """Compare per-row generate_email against the batch generate_emails"""
+    generator = ProfessionalEmailGenerator()
+    df = make_contacts(generator, rows, unknown_share=0.02)
+
+    start = time.perf_counter()
+    expected = generate_loop(generator, df)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    emails, errors = generator.generate_emails(df, 'first_name', 'last_name', 'company')
+    batch_time = time.perf_counter() - start
+
+    assert emails.tolist() == expected, "generate_emails output differs from generate_email"
+
+    print(f"📊 generate_email vs generate_emails ({rows:,} rows, {int(errors.sum()):,} errors)")
+    print(f"   per-row loop: {loop_time:8.3f}s  ({rows / loop_time:12,.0f} rows/s)")
+    print(f"   batch:        {batch_time:8.3f}s  ({rows / batch_time:12,.0f} rows/s)")
+    print(f"   speedup:      {loop_time / batch_time:8.1f}x")
+
+
+def bench_memory(rows):
+    """Memory per contact: plain dicts (the previous representation) vs ContactRecords
+
+    Contacts are parsed from a CSV file, so every row starts with its own
+    string objects as after a real import; the dicts keep date_added as a
+    formatted string, the records intern company/language/source and keep
+    an integer epoch.
+    """
+    generator = ProfessionalEmailGenerator()
+    df = make_contacts(generator, rows)
+    store = make_store(generator, df)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'contacts.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            write_csv(store, f, EXCEL_COLUMNS)
+        del store
+
+        def build(convert):
+            with open(path, newline='', encoding='utf-8') as f:
+                tracemalloc.start()
+                try:
+                    contacts = [convert(row, i) for i, row in enumerate(csv.DictReader(f), 1)]
+                    return tracemalloc.get_traced_memory()[0] / rows, len(contacts)
+                finally:
+                    tracemalloc.stop()
+
+        dict_bytes, _ = build(lambda row, i: dict(row, id=i))
+        record_bytes, _ = build(lambda row, i: ContactRecord(row, id=i))
+
+    print(f"📊 Memory per contact ({rows:,} contacts parsed from CSV)")
+    print(f"   dict:          {dict_bytes:8.0f} bytes")
+    print(f"   ContactRecord: {record_bytes:8.0f} bytes")
+    print(f"   saving:        {dict_bytes - record_bytes:8.0f} bytes/contact ({1 - record_bytes / dict_bytes:.0%})")
+
+
+def bench_concurrency(threads, adds, seconds=1.0):
+    """Stress test: threads generating emails while companies are added to a shared registry
+
+    Runs on a copy of companies.json. Each reader repeatedly takes the
+    registry snapshot and checks that it is consistent (as many companies
+    listed in categories as there are formats, versions never going
+    back), then generates single emails and a batch for companies of that
+    snapshot, checking every "Stress Co N" address against its pattern.
+    Throughput is measured with readers alone, then while one writer adds
+    companies. Returns the number of violations found.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'companies.json')
+        shutil.copy(REGISTRY_PATH, path)
+        generator = ProfessionalEmailGenerator(registry=CompanyRegistry(path))
+        violations = []
+        stop = threading.Event()
+
+        def read(counts, slot):
+            last_version = 0
+            rng = np.random.default_rng(slot)
+            try:
+                while not stop.is_set():
+                    snapshot = generator.registry.snapshot
+                    if snapshot.version < last_version:
+                        violations.append(f"version went from {last_version} back to {snapshot.version}")
+                    last_version = snapshot.version
+                    formats = snapshot.formats
+                    if sum(len(companies) for companies in snapshot.categories.values()) != len(formats):
+                        violations.append(f"categories and formats disagree at version {snapshot.version}")
+                    companies = list(formats)
+                    for company in np.array(companies, dtype=object)[rng.integers(len(companies), size=20)]:
+                        email = generator.generate_email("Jean", "Dupont", company)
+                        if company.startswith("Stress Co ") and email != f"jean.dupont@stress{company[10:]}.com":
+                            violations.append(f"{company} generated {email}")
+                    batch = pd.DataFrame({'first_name': "Jean", 'last_name': "Dupont", 'company': companies[-20:]})
+                    _, errors = generator.generate_emails(batch)
+                    if errors.any():
+                        violations.append(f"batch at version {snapshot.version} failed for a known company")
+                    counts[slot] += 21
+            except Exception as e:
+                violations.append(f"reader raised {type(e).__name__}: {e}")
+
+        def run_readers(writer=None):
+            counts = [0] * threads
+            stop.clear()
+            readers = [threading.Thread(target=read, args=(counts, slot)) for slot in range(threads)]
+            start = time.perf_counter()
+            for reader in readers:
+                reader.start()
+            if writer is not None:
+                writer()
+            else:
+                time.sleep(seconds)
+            stop.set()
+            for reader in readers:
+                reader.join()
+            return sum(counts) / (time.perf_counter() - start)
+
+        def write():
+            for i in range(adds):
+                generator.add_company(f"Stress Co {i}", f"{{f}}.{{l}}@stress{i}.com", "Stress")
+
+        idle_rate = run_readers()
+        start = time.perf_counter()
+        busy_rate = run_readers(write)
+        add_rate = adds / (time.perf_counter() - start)
+
+        missing = [i for i in range(adds) if f"Stress Co {i}" not in generator.company_formats]
+        if missing:
+            violations.append(f"{len(missing)} added companies missing")
+        if CompanyRegistry(path).to_data() != generator.registry.to_data():
+            violations.append("registry file differs from the published snapshot")
+
+    print(f"🧵 Concurrency stress test: {threads} reader threads, {adds} companies added")
+    print(f"   generations/s, readers alone:    {idle_rate:12,.0f}")
+    print(f"   generations/s, while writing:    {busy_rate:12,.0f}")
+    print(f"   companies added/s:               {add_rate:12,.1f}")
+    for violation in violations[:10]:
+        print(f"   ❌ {violation}")
+    print(f"{'❌' if violations else '✅'} {len(violations)} violation(s)")
+    return len(violations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the email generator hot paths")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the suite and save the results as JSON")
+    run.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="row counts to test")
+    run.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    run.add_argument('--output', default=f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+    compare = commands.add_parser('compare', help="flag regressions between two result files")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                         help="relative change considered a regression (default: 0.10)")
+
+    speedup = commands.add_parser('speedup', help="per-row vs batch generation")
+    speedup.add_argument('--rows', type=int, default=1_000_000, help="number of synthetic contacts")
+
+    memory = commands.add_parser('memory', help="memory per contact: dicts vs ContactRecords")
+    memory.add_argument('--rows', type=int, default=1_000_000, help="number of synthetic contacts")
+
+    stress = commands.add_parser('stress', help="concurrent generation while companies are added")
+    stress.add_argument('--threads', type=int, default=8, help="reader threads")
+    stress.add_argument('--adds', type=int, default=200, help="companies added by the writer")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        print(f"📊 Benchmark: {', '.join(args.cases)} at {', '.join(f'{n:,}' for n in args.sizes)} rows")
+        document = run_suite(args.sizes, args.cases, args.seed, memory=not args.no_memory)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"✅ Results saved to {args.output}")
+        return 0
+
+    if args.command == 'compare':
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+        rows = compare_runs(baseline, current, args.threshold)
+        for row in rows:
+            memory = f"{row['memory_change']:+8.1%}" if row['memory_change'] is not None else '     n/a'
+            flag = '❌ REGRESSION' if row['regression'] else '✅'
+            print(f"   {row['case']:16s} {row['rows']:>10,} rows  throughput {row['throughput_change']:+8.1%}  "
+                  f"memory {memory}  {flag}")
+        regressions = sum(row['regression'] for row in rows)
+        print(f"{'❌' if regressions else '✅'} {regressions} regression(s) beyond {args.threshold:.0%}")
+        return 1 if regressions else 0
+
+    if args.command == 'memory':
+        bench_memory(args.rows)
+        return 0
+
+    if args.command == 'stress':
+        return 1 if bench_concurrency(args.threads, args.adds) else 0
+
+    bench_generate_emails(args.rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
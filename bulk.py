@@ -0,0 +1,144 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from contact_import import DEFAULT_CHUNK_SIZE, iter_chunks
+
+# Rows of each chunk listed in the error report (the count is always exact)
+MAX_REPORTED_ROWS = 20
+
+# Generator and options of the current worker process, set up once by init_worker
+_generator = None
+_resolve_companies = False
+
+
+def init_worker(registry_data, resolve_companies):
+    """Build the worker's generator once, with the parent's company registry"""
+    global _generator, _resolve_companies
+    from company_registry import CompanyRegistry
+    from main import ProfessionalEmailGenerator
+
+    _generator = ProfessionalEmailGenerator(registry=CompanyRegistry.from_data(registry_data))
+    _resolve_companies = resolve_companies
+
+
+def error_reasons(df, errors, columns):
+    """Why each failed row could not be generated"""
+    first_col, last_col, _ = columns
+    # astype(bool): mapping an empty str column gives an empty str column
+    missing = (df[first_col].map(lambda v: not isinstance(v, str)).astype(bool)
+               | df[last_col].map(lambda v: not isinstance(v, str)).astype(bool))
+    return pd.Series('unknown company', index=df.index).where(~missing, 'missing name')[errors]
+
+
+def generate_chunk(task):
+    """Generate the emails of one chunk; runs in a worker process
+
+    Returns (chunk number, CSV text without header, report dict). The CSV
+    text is produced here so the parent process only has to write it.
+    """
+    number, first_row, df, columns = task
+    first_col, last_col, company_col = columns
+    emails, errors = _generator.generate_emails(
+        df, first_col, last_col, company_col, resolve_companies=_resolve_companies
+    )
+    df = df.assign(email=emails)
+
+    reasons = error_reasons(df, errors, columns)
+    report = {
+        'chunk': number,
+        'first_row': first_row,
+        'rows': len(df),
+        'generated': int((~errors).sum()),
+        'errors': int(errors.sum()),
+        'reasons': {reason: int(count) for reason, count in reasons.value_counts().items()},
+        'error_rows': [first_row + int(i) for i in errors.to_numpy().nonzero()[0][:MAX_REPORTED_ROWS]],
+    }
+    return number, df.to_csv(index=False, header=False), report
+
+
+def run_bulk(input_path, output_path, generator, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+             columns=('first_name', 'last_name', 'company'), resolve_companies=False, progress=None):
+    """Generate emails for every row of a CSV/xlsx file with a pool of worker processes
+
+    The input is read chunk by chunk and each chunk is generated in a worker.
+    At most two chunks per worker are in flight, and results are written in
+    input order as soon as the oldest chunk is done, so memory stays bounded
+    whatever the file size. The output is the input with an 'email' column
+    (empty where generation failed). If given, progress(report) is called
+    for every chunk in order. Every column is read and written back as
+    text, so the output matches the input apart from the added 'email'
+    column, header included even when there are no rows. Returns the list
+    of per-chunk reports.
+    """
+    workers = workers or os.cpu_count() or 1
+    reports = []
+
+    def write(future, out):
+        _, text, report = future.result()
+        out.write(text)
+        reports.append(report)
+        if progress is not None:
+            progress(report)
+
+    # Read as text, so the columns passed through come out exactly as they went in
+    chunks = iter_chunks(input_path, chunk_size=chunk_size, as_text=True)
+    with ProcessPoolExecutor(workers, initializer=init_worker,
+                             initargs=(generator.registry.to_data(), resolve_companies)) as pool, \
+            open(output_path, 'w', newline='', encoding='utf-8') as out:
+        pending = deque()
+        first_row = 0
+        for number, df in enumerate(chunks):
+            missing = [column for column in columns if column not in df.columns]
+            if missing:
+                raise ValueError(f"Missing column(s) in {input_path}: {', '.join(missing)}")
+            if number == 0:
+                out.write(df.head(0).assign(email=None).to_csv(index=False))
+
+            pending.append(pool.submit(generate_chunk, (number, first_row, df, tuple(columns))))
+            first_row += len(df)
+            if len(pending) >= 2 * workers:
+                write(pending.popleft(), out)
+        while pending:
+            write(pending.popleft(), out)
+    return reports
+
+
+def bulk_main(argv=None):
+    """Entry point of `python main.py bulk in.csv out.csv [options]`"""
+    import argparse
+
+    from main import ProfessionalEmailGenerator
+
+    parser = argparse.ArgumentParser(prog='main.py bulk', description='Generate emails for a whole file')
+    parser.add_argument('input', help='input .csv or .xlsx file')
+    parser.add_argument('output', help='output .csv file')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per chunk')
+    parser.add_argument('--first-col', default='first_name')
+    parser.add_argument('--last-col', default='last_name')
+    parser.add_argument('--company-col', default='company')
+    parser.add_argument('--resolve', action='store_true', help='fuzzy-match unknown company names')
+    parser.add_argument('--report', help='write the per-chunk error report to this JSON file')
+    args = parser.parse_args(argv)
+
+    def show(report):
+        print(f"📦 Chunk {report['chunk']}: {report['generated']}/{report['rows']} generated"
+              + (f", {report['errors']} errors {report['reasons']}" if report['errors'] else ''))
+
+    reports = run_bulk(
+        args.input, args.output, ProfessionalEmailGenerator(), workers=args.workers,
+        chunk_size=args.chunk_size, columns=(args.first_col, args.last_col, args.company_col),
+        resolve_companies=args.resolve, progress=show,
+    )
+    generated = sum(report['generated'] for report in reports)
+    errors = sum(report['errors'] for report in reports)
+    print(f"✅ {generated} emails written to {args.output} ({errors} errors)")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+        print(f"📝 Error report saved to {args.report}")
+    return 1 if errors else 0
@@ -0,0 +1,114 @@
+import csv
+from functools import lru_cache
+from itertools import islice
+
+from email_formats import EmailFormat
+
+# Local-part patterns tried after the registry format, most common first
+ALTERNATE_PATTERNS = [
+    '{f}.{l}', '{fi}{l}', '{f}{l}', '{f}_{l}', '{fi}.{l}', '{f}-{l}',
+    '{l}.{f}', '{l}{f}', '{l}{fi}', '{f}{li}', '{f}', '{l}',
+]
+
+DEFAULT_MAX_CANDIDATES = 10
+
+# Characters patterns put between name parts; a local part cannot start or end with one
+SEPARATORS = '._-'
+
+
+@lru_cache(maxsize=4096)
+def compiled(pattern):
+    """EmailFormat for a pattern, compiled once per distinct pattern"""
+    return EmailFormat(pattern)
+
+
+def split_domain(pattern):
+    """(local-part pattern, domain) of a full email format"""
+    local, _, domain = pattern.rpartition('@')
+    return local, domain
+
+
+def compound_variants(name):
+    """Spellings of a normalized name: as is, compacted, then each part of a compound"""
+    variants = [name]
+    parts = name.replace("'", '-').split('-')
+    if len(parts) > 1:
+        variants.append(''.join(parts))
+        variants.extend(part for part in (parts[0], parts[-1]) if part)
+    return list(dict.fromkeys(variants))
+
+
+def name_pairs(first_clean, last_clean):
+    """(first, last) spelling pairs, the most faithful combinations first"""
+    firsts = compound_variants(first_clean)
+    lasts = compound_variants(last_clean)
+    pairs = [(i, j) for i in range(len(firsts)) for j in range(len(lasts))]
+    pairs.sort(key=lambda ij: (ij[0] + ij[1], ij[0]))
+    return [(firsts[i], lasts[j]) for i, j in pairs]
+
+
+def rank_candidates(pattern, first_clean, last_clean, alternates=ALTERNATE_PATTERNS):
+    """Yield distinct candidate addresses for one person, best guess first
+
+    Candidates combine a local-part pattern (the registry pattern, then the
+    alternates on the same domain) with a spelling of the names (normalized,
+    then compound variants). They are ranked along the diagonals of that
+    grid, so the registry pattern with the plain names comes first and
+    neither the alternates nor the compound spellings crowd the other out.
+    Renderings with an empty local part, or one that starts or ends with a
+    separator (a name part came out empty), are skipped.
+    """
+    local, domain = split_domain(pattern)
+    pairs = name_pairs(first_clean, last_clean)
+    renders = [compiled(pattern).render] + [
+        compiled(f"{alternate}@{domain}").render for alternate in alternates if alternate != local
+    ]
+
+    seen = set()
+    for rank in range(len(renders) + len(pairs) - 1):
+        for p in range(max(0, rank - len(pairs) + 1), min(rank, len(renders) - 1) + 1):
+            email = renders[p](*pairs[rank - p])
+            local_part = email.rpartition('@')[0]
+            if not local_part or local_part[0] in SEPARATORS or local_part[-1] in SEPARATORS:
+                continue
+            if email not in seen:
+                seen.add(email)
+                yield email
+
+
+def iter_candidates(generator, people, max_candidates=DEFAULT_MAX_CANDIDATES, on_error=None):
+    """Lazily yield (first_name, last_name, company, rank, email) for each person
+
+    people is any iterable of (first_name, last_name, company). Candidates
+    are computed one person at a time, so arbitrarily large inputs stream
+    through in constant memory. Companies that are not registry keys are
+    matched with generator.resolve_company; people whose company cannot be
+    resolved are skipped (reported to on_error(person, error) if given).
+    """
+    for person in people:
+        first_name, last_name, company = person
+        try:
+            emails = generator.generate_candidates(first_name, last_name, company, max_candidates)
+        except ValueError as e:
+            if on_error is not None:
+                on_error(person, e)
+            continue
+        for rank, email in enumerate(emails, 1):
+            yield first_name, last_name, company, rank, email
+
+
+def write_candidates(generator, people, path, max_candidates=DEFAULT_MAX_CANDIDATES, on_error=None):
+    """Stream candidates for people into a CSV file, returning the number of rows written"""
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['first_name', 'last_name', 'company', 'rank', 'email'])
+        for row in iter_candidates(generator, people, max_candidates, on_error):
+            writer.writerow(row)
+            rows += 1
+    return rows
+
+
+def top_candidates(pattern, first_clean, last_clean, max_candidates=DEFAULT_MAX_CANDIDATES):
+    """The first max_candidates ranked candidates for one person"""
+    return list(islice(rank_candidates(pattern, first_clean, last_clean), max_candidates))
@@ -0,0 +1,318 @@
+import hashlib
+import json
+import marshal
+import os
+import threading
+from array import array
+from types import MappingProxyType
+
+from email_formats import parse_format
+
+# Registry shipped with the app: {category: {company: format pattern}}
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'companies.json')
+
+# Compiled copy of the registry, stored next to it
+SNAPSHOT_SUFFIX = '.snapshot'
+
+# Bumped whenever the snapshot layout changes, so old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+# Category of companies added without one
+DEFAULT_CATEGORY = 'Other'
+
+
+def source_stamp(path):
+    """(mtime in ns, size) of a file: a cheap test of whether it changed"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RegistryError(ValueError):
+    """Raised when the registry file cannot be parsed or holds an invalid entry"""
+
+
+def compile_registry(data):
+    """Flatten {category: {company: pattern}} into the snapshot payload
+
+    The payload holds all names and all patterns as two newline-joined
+    strings plus one category code per company, so loading it costs a few
+    large string copies instead of building every dict entry up front.
+    Every pattern is validated (once per distinct pattern), raising
+    ValueError with the company it belongs to, so a bad entry is never
+    published.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected {{category: {{company: format}}}}, got {type(data).__name__}")
+    categories = list(data)
+    names, patterns, codes = [], [], array('H')
+    owners = {}
+    for code, category in enumerate(categories):
+        companies = data[category]
+        if not isinstance(companies, dict):
+            raise ValueError(f"Category {category!r} must map companies to formats, got {type(companies).__name__}")
+        for company, pattern in companies.items():
+            if not isinstance(pattern, str):
+                raise ValueError(f"Invalid email format for {company!r}: expected a string, got {type(pattern).__name__}")
+            if '\n' in company or '\n' in pattern:
+                raise ValueError(f"Company names and formats cannot contain line breaks: {company!r}")
+            owners.setdefault(pattern, company)
+            names.append(company)
+            patterns.append(pattern)
+            codes.append(code)
+    for pattern, company in owners.items():
+        try:
+            parse_format(pattern)
+        except ValueError as e:
+            raise ValueError(f"{company!r}: {e}") from None
+    return '\n'.join(names), '\n'.join(patterns), tuple(categories), codes.tobytes()
+
+
+def write_atomic(path, data):
+    """Replace a file's content in one step, so readers never see a partial file"""
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+class RegistrySnapshot:
+    """One immutable version of the registry
+
+    formats and categories are read-only views built on first use; two
+    threads racing to build them produce equal values, so no lock is
+    needed. Changing the registry means building a new snapshot.
+    """
+
+    __slots__ = ('payload', 'version', 'stamp', '_formats', '_categories')
+
+    def __init__(self, payload, version, stamp=None):
+        self.payload = payload
+        self.version = version
+        self.stamp = stamp
+        self._formats = None
+        self._categories = None
+
+    @property
+    def formats(self):
+        """{company: format pattern}"""
+        formats = self._formats
+        if formats is None:
+            names, patterns, _, _ = self.payload
+            formats = dict(zip(names.split('\n'), patterns.split('\n'))) if names else {}
+            formats = self._formats = MappingProxyType(formats)
+        return formats
+
+    @property
+    def categories(self):
+        """{category: (companies)}, in file order"""
+        categories = self._categories
+        if categories is None:
+            names, _, category_names, codes = self.payload
+            companies = {category: [] for category in category_names}
+            if names:
+                codes = array('H', codes)
+                for company, code in zip(names.split('\n'), codes):
+                    companies[category_names[code]].append(company)
+            categories = self._categories = MappingProxyType(
+                {category: tuple(members) for category, members in companies.items()}
+            )
+        return categories
+
+    def category_of(self, company):
+        for category, companies in self.categories.items():
+            if company in companies:
+                return category
+        return None
+
+    def to_data(self):
+        """{category: {company: pattern}}, the layout of the JSON file (a fresh, mutable copy)"""
+        formats = self.formats
+        return {
+            category: {company: formats[company] for company in companies}
+            for category, companies in self.categories.items()
+        }
+
+
+class CompanyRegistry:
+    """Company email formats and categories, backed by a JSON file
+
+    The JSON file is the single source of truth. It is loaded through a
+    compiled snapshot (<file>.snapshot) that is reused as long as the
+    file's mtime and size, or failing that its SHA-256, are unchanged.
+    reload_if_changed() picks up edits to the file without a restart,
+    and add() writes new companies back to it. An edit that does not
+    parse or holds an invalid format is refused: the registry keeps its
+    current snapshot and `error` describes the problem until the file is
+    fixed.
+
+    The registry is shared by every session and thread, so its content
+    lives in an immutable RegistrySnapshot. Writers build a new snapshot
+    under a lock and swap it in with a single assignment; readers never
+    lock. A reader that needs several lookups to agree (one generation
+    call, one page) takes `snapshot` once and works from it. `version`
+    increases on every change.
+    """
+
+    def __init__(self, path=REGISTRY_PATH, snapshot_path=None):
+        self.path = path
+        self.snapshot_path = snapshot_path or (f"{path}{SNAPSHOT_SUFFIX}" if path else None)
+        self.snapshot = RegistrySnapshot(compile_registry({}), 0)
+        self._write_lock = threading.Lock()
+        self.error = None            # why the latest edit of the file was refused, if it was
+        self._refused_stamp = None   # stamp of that edit, so it is not parsed again on every check
+        if path is not None:
+            self.load()
+
+    @classmethod
+    def from_data(cls, data):
+        """In-memory registry (no file) from {category: {company: pattern}}"""
+        registry = cls(path=None)
+        registry._publish(compile_registry(data))
+        return registry
+
+    @property
+    def version(self):
+        return self.snapshot.version
+
+    @property
+    def formats(self):
+        """{company: format pattern} of the current snapshot"""
+        return self.snapshot.formats
+
+    @property
+    def categories(self):
+        """{category: (companies)} of the current snapshot"""
+        return self.snapshot.categories
+
+    def category_of(self, company):
+        return self.snapshot.category_of(company)
+
+    def to_data(self):
+        return self.snapshot.to_data()
+
+    def load(self):
+        """Load the registry file, through its snapshot when it is still current"""
+        with self._write_lock:
+            self._load()
+
+    def _load(self):
+        stamp = source_stamp(self.path)
+        snapshot = self._read_snapshot()
+        if snapshot is not None and snapshot[0][1] == stamp:
+            self._publish(snapshot[1], stamp)
+            return
+
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if snapshot is not None and snapshot[0][2] == digest:
+            # Touched but not edited: keep the compiled data, refresh the stamp
+            payload = snapshot[1]
+        else:
+            try:
+                payload = compile_registry(json.loads(raw))
+            except ValueError as e:
+                raise RegistryError(f"{self.path}: {e}") from None
+        self._publish(payload, stamp)
+        self._write_snapshot(payload, stamp, digest)
+
+    def reload_if_changed(self):
+        """Reload the registry if its file changed since it was loaded; True if it did
+
+        An invalid edit raises RegistryError once and leaves the current
+        snapshot in place; later calls return False until the file changes
+        again, and `error` keeps the message meanwhile.
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        if source_stamp(self.path) in (self.snapshot.stamp, self._refused_stamp):
+            return False
+        with self._write_lock:
+            # Another thread may have reloaded (or refused) it while we waited
+            stamp = source_stamp(self.path)
+            if stamp in (self.snapshot.stamp, self._refused_stamp):
+                return False
+            self._reload(stamp)
+        return True
+
+    def _reload(self, stamp):
+        """Load the file (stamped stamp) under the write lock, remembering a refusal"""
+        try:
+            self._load()
+        except RegistryError as e:
+            self.error, self._refused_stamp = str(e), stamp
+            raise
+        self.error, self._refused_stamp = None, None
+
+    def _catch_up(self):
+        """Under the write lock: reload the file if it was edited since the snapshot was taken
+
+        Raises RegistryError if the file holds a refused edit, so a write
+        never overwrites changes made to the file behind our back.
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return
+        stamp = source_stamp(self.path)
+        if stamp == self.snapshot.stamp:
+            return
+        if stamp == self._refused_stamp:
+            raise RegistryError(f"{self.error} (fix the file before changing the registry)")
+        self._reload(stamp)
+
+    def add(self, company, pattern, category=None):
+        """Register (or update) a company and save the registry file
+
+        Edits made to the file since it was loaded are picked up first, so
+        they are kept; an invalid edit raises RegistryError instead of
+        being overwritten.
+        """
+        with self._write_lock:
+            self._catch_up()
+            current = self.snapshot
+            data = current.to_data()
+            previous = current.category_of(company)
+            category = category or previous or DEFAULT_CATEGORY
+            if previous is not None and previous != category:
+                del data[previous][company]
+            data.setdefault(category, {})[company] = pattern
+            payload = compile_registry(data)
+            stamp = self._save(payload, data) if self.path is not None else None
+            self._publish(payload, stamp)
+
+    def save(self):
+        """Write the registry file and its snapshot"""
+        with self._write_lock:
+            self._catch_up()
+            current = self.snapshot
+            stamp = self._save(current.payload, current.to_data())
+            # Same content, so the version stays; only the file stamp is new
+            self.snapshot = RegistrySnapshot(current.payload, current.version, stamp)
+
+    def _save(self, payload, data):
+        """Write data to the registry file and payload to its snapshot; returns the file's new stamp"""
+        raw = (json.dumps(data, indent=4, ensure_ascii=False) + '\n').encode('utf-8')
+        write_atomic(self.path, raw)
+        stamp = source_stamp(self.path)
+        self._write_snapshot(payload, stamp, hashlib.sha256(raw).hexdigest())
+        return stamp
+
+    def _publish(self, payload, stamp=None):
+        """Swap in a new snapshot: readers see either the old one or the new one, never a mix"""
+        self.snapshot = RegistrySnapshot(payload, self.snapshot.version + 1, stamp)
+
+    def _read_snapshot(self):
+        """(header, payload) of the snapshot, or None if it is missing, stale or unreadable"""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                header, payload = marshal.loads(f.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+        if header[0] != SNAPSHOT_VERSION:
+            return None
+        return header, payload
+
+    def _write_snapshot(self, payload, stamp, digest):
+        try:
+            write_atomic(self.snapshot_path, marshal.dumps(((SNAPSHOT_VERSION, stamp, digest), payload)))
+        except OSError:
+            pass  # read-only install: the registry still works, just without the cache
@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+from name_normalizer import FOLD_TABLE
+
+# Common spellings and abbreviations of registered companies
+COMPANY_ALIASES = {
+    "GS": "Goldman Sachs",
+    "JP Morgan Chase": "JPMorgan",
+    "JPMorgan Chase": "JPMorgan",
+    "JPM": "JPMorgan",
+    "MS": "Morgan Stanley",
+    "CS": "Credit Suisse",
+    "Citi": "Citigroup",
+    "Citibank": "Citigroup",
+    "DB": "Deutsche Bank",
+    "RBC": "RBC Capital Markets",
+    "Rothschild": "Rothschild & Co",
+    "StanChart": "Standard Chartered",
+    "BNP": "BNP Paribas",
+    "CACIB": "Crédit Agricole CIB",
+    "Crédit Agricole": "Crédit Agricole CIB",
+    "SocGen": "Société Générale CIB",
+    "SG CIB": "Société Générale CIB",
+    "Société Générale": "Société Générale CIB",
+    "Groupe BPCE": "BPCE",
+    "AXA IM": "AXA Investment Managers",
+    "Boston Consulting Group": "BCG",
+    "Ernst & Young": "EY",
+    "PricewaterhouseCoopers": "PwC",
+    "CVC": "CVC Capital",
+    "CVC Capital Partners": "CVC Capital",
+    "Advent": "Advent International",
+    "Apax": "Apax Partners",
+    "Tikehau": "Tikehau Capital",
+}
+
+# Legal-form and filler words ignored when comparing company names
+STOPWORDS = {
+    'the', 'and', 'co', 'company', 'inc', 'incorporated', 'corp', 'corporation',
+    'ltd', 'limited', 'llc', 'llp', 'lp', 'plc', 'sa', 'sas', 'ag', 'se', 'nv',
+}
+
+# Minimum trigram similarity for a fuzzy match
+MIN_SCORE = 0.6
+
+
+def fold_company(text):
+    """Accent-, case- and punctuation-folded key of a company name
+
+    Words are folded like names, legal forms are dropped and the remaining
+    words are joined without spaces, so "J.P. Morgan", "JP Morgan" and
+    "JPMorgan" share one key.
+    """
+    words = text.translate(FOLD_TABLE).replace("'", '').split()
+    kept = [word for word in words if word not in STOPWORDS]
+    return ''.join(kept or words)
+
+
+def key_trigrams(key):
+    """Trigrams of a folded key, padded so short keys still have some"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyResolver:
+    """Maps free-text company names onto the companies of the format registry
+
+    Resolution tries, in order: the folded exact index (registered names and
+    aliases, score 1.0), then a trigram similarity index over the same keys,
+    returning the best company with its Dice similarity as confidence.
+    Results are memoized per distinct input string.
+    """
+
+    def __init__(self, companies, aliases=None, min_score=MIN_SCORE):
+        self.min_score = min_score
+        self._exact = {}
+        self._keys = []
+        self._postings = defaultdict(list)
+        self._cache = {}
+
+        names = {company: company for company in companies}
+        for alias, company in (COMPANY_ALIASES if aliases is None else aliases).items():
+            if company in names:
+                names.setdefault(alias, company)
+
+        for name, company in names.items():
+            key = fold_company(name)
+            if not key or key in self._exact:
+                continue
+            self._exact[key] = company
+            grams = key_trigrams(key)
+            entry = len(self._keys)
+            self._keys.append((company, len(grams)))
+            for gram in grams:
+                self._postings[gram].append(entry)
+
+    def resolve(self, text):
+        """Return (company, confidence) for a free-text name, or (None, 0.0)"""
+        cached = self._cache.get(text)
+        if cached is None:
+            cached = self._cache[text] = self._resolve(text)
+        return cached
+
+    def resolve_many(self, values):
+        """Resolve an iterable of names, each distinct value only once"""
+        return [self.resolve(value) for value in values]
+
+    def _resolve(self, text):
+        if not isinstance(text, str):
+            return None, 0.0
+        key = fold_company(text)
+        if not key:
+            return None, 0.0
+        if key in self._exact:
+            return self._exact[key], 1.0
+
+        grams = key_trigrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for entry in self._postings.get(gram, ()):
+                shared[entry] += 1
+
+        best_company, best_score = None, 0.0
+        for entry, count in shared.items():
+            company, size = self._keys[entry]
+            score = 2 * count / (len(grams) + size)
+            if score > best_score:
+                best_company, best_score = company, score
+
+        if best_score < self.min_score:
+            return None, best_score
+        return best_company, best_score
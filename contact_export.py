@@ -0,0 +1,97 @@
+import csv
+import io
+
+from openpyxl import Workbook
+
+from metrics import instrumented
+
+# Column layouts used by the CLI export and by the Streamlit downloads
+EXCEL_COLUMNS = ['name', 'email', 'company', 'position', 'source', 'language', 'custom_message', 'date_added']
+DOWNLOAD_COLUMNS = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message']
+
+# Rows buffered per csv writerows() call
+CSV_CHUNK_SIZE = 10_000
+
+
+def cell_value(value):
+    """Blank out missing values (None/NaN) the way pandas exports do"""
+    if value is None or value != value:
+        return None
+    return value
+
+
+def iter_rows(contacts, columns):
+    """Yield one tuple per contact with the values of columns"""
+    for contact in contacts:
+        yield tuple(cell_value(contact.get(column)) for column in columns)
+
+
+@instrumented('write_xlsx')
+def write_xlsx(contacts, target, columns=EXCEL_COLUMNS, sheet_name='Contacts'):
+    """Stream contacts into an xlsx file (path or binary file object)
+
+    openpyxl's write-only mode serializes rows as they are appended instead
+    of building the whole sheet in memory first.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(columns)
+    for row in iter_rows(contacts, columns):
+        sheet.append(row)
+    workbook.save(target)
+
+
+@instrumented('write_csv')
+def write_csv(contacts, target, columns=DOWNLOAD_COLUMNS, chunk_size=CSV_CHUNK_SIZE):
+    """Stream contacts into a CSV text file object, chunk_size rows at a time"""
+    writer = csv.writer(target, lineterminator='\n')
+    writer.writerow(columns)
+    chunk = []
+    for row in iter_rows(contacts, columns):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            writer.writerows(chunk)
+            chunk = []
+    writer.writerows(chunk)
+
+
+def xlsx_bytes(contacts, columns=EXCEL_COLUMNS):
+    """Contacts serialized as an in-memory xlsx payload"""
+    output = io.BytesIO()
+    write_xlsx(contacts, output, columns)
+    return output.getvalue()
+
+
+def csv_text(contacts, columns=DOWNLOAD_COLUMNS):
+    """Contacts serialized as an in-memory CSV payload"""
+    output = io.StringIO()
+    write_csv(contacts, output, columns)
+    return output.getvalue()
+
+
+EXPORT_FORMATS = {
+    'xlsx': xlsx_bytes,
+    'csv': csv_text,
+}
+
+
+class ExportCache:
+    """Export payloads cached against a ContactStore's version counter
+
+    A payload is rebuilt only when the store changed since it was last
+    generated, so repeated downloads of unchanged data are free.
+    """
+
+    def __init__(self):
+        self._payloads = {}
+
+    def get(self, store, fmt, columns):
+        """Return the fmt ('xlsx' or 'csv') payload of store, rebuilding it if stale"""
+        key = (id(store), fmt, tuple(columns))
+        cached = self._payloads.get(key)
+        if cached is not None and cached[0] == store.version:
+            return cached[1]
+
+        payload = EXPORT_FORMATS[fmt](store, columns)
+        self._payloads[key] = (store.version, payload)
+        return payload
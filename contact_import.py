@@ -0,0 +1,117 @@
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from metrics import instrumented
+
+# Fields every imported contact must have (filled with "" when the file lacks them)
+REQUIRED_FIELDS = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message']
+
+# Rows read, normalized and inserted at a time; bounds peak memory during imports
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+# read_csv options that keep every cell as written: no type inference, and
+# only empty cells (not 'NA', 'null', 'None'...) read as missing
+TEXT_CSV_OPTIONS = {'dtype': str, 'keep_default_na': False, 'na_values': ['']}
+
+
+def iter_csv_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, as_text=False):
+    """Read a CSV file as DataFrames of at most chunk_size rows (all str columns if as_text)"""
+    with pd.read_csv(source, chunksize=chunk_size, **(TEXT_CSV_OPTIONS if as_text else {})) as reader:
+        yield from reader
+
+
+def excel_text(value):
+    """A cell as text: integral numbers without '.0', None left missing"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_excel_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, as_text=False):
+    """Read the first sheet of an xlsx file as DataFrames of at most chunk_size rows
+
+    Uses openpyxl's read-only mode, which parses the sheet lazily instead of
+    loading the whole workbook. With as_text, every cell is read as text.
+    A sheet with a header but no rows yields one empty DataFrame, as CSV
+    files do.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(value) if value is not None else f"Unnamed: {i}"
+            for i, value in enumerate(header)
+        ]
+
+        dtype = object if as_text else None
+        batch, chunks = [], 0
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(tuple(map(excel_text, row)) if as_text else row)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=columns, dtype=dtype)
+                batch, chunks = [], chunks + 1
+        if batch or not chunks:
+            yield pd.DataFrame(batch, columns=columns, dtype=dtype)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(source, filename=None, chunk_size=DEFAULT_CHUNK_SIZE, as_text=False):
+    """Read an .xlsx or .csv file (path or file object) in chunks
+
+    With as_text, every column is read as text exactly as written (empty
+    cells missing), for callers that pass the data through untouched.
+    """
+    filename = filename or str(source)
+    if filename.lower().endswith('.xlsx'):
+        return iter_excel_chunks(source, chunk_size, as_text)
+    if filename.lower().endswith('.csv'):
+        return iter_csv_chunks(source, chunk_size, as_text)
+    raise ValueError(f"Unsupported file type: {filename} (expected .xlsx or .csv)")
+
+
+def normalize_chunk(df):
+    """Turn an imported chunk into contact dicts with every required field present"""
+    for field in REQUIRED_FIELDS:
+        if field not in df.columns:
+            df[field] = ""
+    if 'date_added' not in df.columns:
+        df['date_added'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return df.to_dict('records')
+
+
+@instrumented('import_contacts')
+def import_contacts(store, source, filename=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    on_duplicate='merge', progress=None, validator=None, on_reject=None):
+    """Stream contacts from a file into a ContactStore, one chunk at a time
+
+    Each chunk is normalized and inserted before the next one is read, so
+    memory use depends on chunk_size rather than on the file size. If given,
+    progress(rows_read, added, duplicates) is called after every chunk.
+    With a ContactValidator, only the rows that pass validation are
+    inserted and on_reject(rejected) receives the others of each chunk,
+    as a DataFrame with a 'reason' column. Returns (added, duplicates).
+    """
+    rows_read = added = duplicates = 0
+    for chunk in iter_chunks(source, filename, chunk_size):
+        rows_read += len(chunk)
+        if validator is not None:
+            chunk, rejected = validator.validate(chunk)
+            if len(rejected) and on_reject is not None:
+                on_reject(rejected)
+        chunk_added, chunk_duplicates = store.add_many(normalize_chunk(chunk), on_duplicate=on_duplicate)
+        added += chunk_added
+        duplicates += chunk_duplicates
+        if progress is not None:
+            progress(rows_read, added, duplicates)
+    return added, duplicates
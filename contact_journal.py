@@ -0,0 +1,246 @@
+import csv
+import json
+import os
+from array import array
+from bisect import bisect_right
+
+from contact_export import EXCEL_COLUMNS, cell_value
+from contact_record import FIELDS
+
+# Kinds of journal entries
+ADD = 'add'
+UPDATE = 'update'
+DELETE = 'delete'
+
+# Columns of a CSV delta: the change, then the contact as in the Excel export
+DELTA_COLUMNS = ['seq', 'op', 'id'] + EXCEL_COLUMNS
+
+# Text fields every restored contact has, blank ('') when the journal holds no value
+TEXT_FIELDS = tuple(field for field in FIELDS if field not in ('id', 'date_added'))
+
+# Delta file formats, by extension
+DELTA_FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+def delta_format(path):
+    """'csv' or 'ndjson', from the file extension"""
+    for extension, fmt in DELTA_FORMATS.items():
+        if str(path).lower().endswith(extension):
+            return fmt
+    raise ValueError(f"Unsupported delta file: {path} (expected {', '.join(DELTA_FORMATS)})")
+
+
+def journal_values(contact):
+    """Contact fields worth journaling: everything but the ID and missing (None/NaN) values
+
+    Blank strings are kept, so a contact comes back from the journal with
+    the same keys it was added with.
+    """
+    return {
+        field: value if isinstance(value, (str, int, float)) else str(value)
+        for field, value in contact.items()
+        if field != 'id' and cell_value(value) is not None
+    }
+
+
+class CheckpointError(ValueError):
+    """Raised when a delta is requested from a checkpoint the journal no longer covers"""
+
+
+class ContactJournal:
+    """Append-only NDJSON log of contact adds, updates and deletes
+
+    Every change is one line {"seq", "op", "id", "contact"} with a
+    sequence number that only ever increases; updates carry the whole
+    contact, deletes none. The byte offset of every entry is kept in
+    memory, so reading the changes since a checkpoint seeks straight to
+    them and costs in proportion to the changes, not to the journal.
+
+    compact() rewrites the file with only the last entry of each live
+    contact, keeping their sequence numbers. Deletes before that point
+    are forgotten, so older checkpoints are refused (CheckpointError)
+    and need a full export instead.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.compacted_seq = 0   # deltas must start at or after this sequence number
+        self.max_id = 0          # highest contact ID ever journaled, deleted or not
+        self._seqs = array('q')
+        self._offsets = array('q')
+        self._scan()
+        self._file = open(path, 'ab')
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def last_seq(self):
+        """Sequence number of the latest entry: the checkpoint of an export made now"""
+        return max(self._seqs[-1], self.compacted_seq) if self._seqs else self.compacted_seq
+
+    def __len__(self):
+        return len(self._seqs)
+
+    def _scan(self):
+        """Index the entries of an existing file, dropping a torn last line"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Interrupted append: the entry never completed
+                    f.truncate(offset)
+                    break
+                entry = json.loads(line)
+                if 'seq' in entry:
+                    self._seqs.append(entry['seq'])
+                    self._offsets.append(offset)
+                    self.max_id = max(self.max_id, entry['id'])
+                else:
+                    self.compacted_seq = entry['compacted']
+                    self.max_id = max(self.max_id, entry['max_id'])
+                offset += len(line)
+
+    def append(self, op, contact_id, contact=None):
+        """Record one change and return its sequence number"""
+        seq = self.last_seq + 1
+        entry = {'seq': seq, 'op': op, 'id': contact_id}
+        if contact is not None:
+            entry['contact'] = journal_values(contact)
+        offset = self._file.tell()
+        self._file.write((json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8'))
+        self._file.flush()
+        self._seqs.append(seq)
+        self._offsets.append(offset)
+        self.max_id = max(self.max_id, contact_id)
+        return seq
+
+    def entries(self, since=0):
+        """Yield the entries with a sequence number above since, oldest first"""
+        if since < self.compacted_seq:
+            raise CheckpointError(
+                f"Checkpoint {since} predates the compaction at {self.compacted_seq}: export everything instead"
+            )
+        return self._read(bisect_right(self._seqs, since))
+
+    def _read(self, start=0):
+        """Yield the entries from the start-th one on"""
+        if start == len(self._seqs):
+            return
+        self._file.flush()
+        with open(self.path, 'rb') as f:
+            f.seek(self._offsets[start])
+            for _ in range(len(self._seqs) - start):
+                yield json.loads(f.readline())
+
+    def changes(self, since=0):
+        """Net change per contact since a checkpoint: {id: its last entry}
+
+        A contact added then edited shows up once, with its final values; one
+        added and deleted in the same window shows up as a delete.
+        """
+        return latest_entries(self.entries(since))
+
+    def live_entries(self):
+        """Last add/update entry of every live contact, by ID, replaying the whole journal"""
+        latest = latest_entries(self._read())
+        return [latest[contact_id] for contact_id in sorted(latest) if latest[contact_id]['op'] != DELETE]
+
+    def contacts(self):
+        """Yield every live contact (with its 'id'), in ID order
+
+        Text fields missing from an entry (journals written before blanks
+        were kept) come back as ''.
+        """
+        blank = dict.fromkeys(TEXT_FIELDS, '')
+        for entry in self.live_entries():
+            yield dict(blank, **entry['contact'], id=entry['id'])
+
+    def compact(self):
+        """Rewrite the journal with one entry per live contact; returns the entries dropped"""
+        live = sorted(self.live_entries(), key=lambda entry: entry['seq'])
+        compacted_seq = self.last_seq
+        dropped = len(self._seqs) - len(live)
+
+        temporary = f"{self.path}.tmp{os.getpid()}"
+        seqs, offsets = array('q'), array('q')
+        with open(temporary, 'wb') as f:
+            header = {'compacted': compacted_seq, 'max_id': self.max_id}
+            f.write((json.dumps(header) + '\n').encode('utf-8'))
+            for entry in live:
+                seqs.append(entry['seq'])
+                offsets.append(f.tell())
+                f.write((json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8'))
+        self._file.close()
+        os.replace(temporary, self.path)
+        self._file = open(self.path, 'ab')
+        self._seqs, self._offsets = seqs, offsets
+        self.compacted_seq = compacted_seq
+        return dropped
+
+
+def latest_entries(entries):
+    """{id: last entry} of a run of entries, ordered by each contact's last change"""
+    latest = {}
+    for entry in entries:
+        latest.pop(entry['id'], None)
+        latest[entry['id']] = entry
+    return latest
+
+
+def delta_rows(entries):
+    """Flatten journal entries into DELTA_COLUMNS tuples (deletes carry only the ID)"""
+    for entry in entries:
+        contact = entry.get('contact', {})
+        yield (entry['seq'], entry['op'], entry['id']) + tuple(contact.get(column) for column in EXCEL_COLUMNS)
+
+
+def write_delta(entries, target, fmt):
+    """Write journal entries to a text file object as CSV or NDJSON; returns how many"""
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(target, lineterminator='\n')
+        writer.writerow(DELTA_COLUMNS)
+        for row in delta_rows(entries):
+            writer.writerow(row)
+            count += 1
+    else:
+        for entry in entries:
+            target.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def export_changes(journal, path, since=0):
+    """Write the net changes since a checkpoint to a .csv or .ndjson file
+
+    Returns (changes written, new checkpoint). Pass the checkpoint back as
+    since next time to get only what changed in between.
+    """
+    fmt = delta_format(path)
+    checkpoint = journal.last_seq
+    changes = journal.changes(since)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        count = write_delta(changes.values(), f, fmt)
+    return count, checkpoint
+
+
+def export_compacted(journal, path):
+    """Write a full snapshot of the live contacts, rebuilt from the journal
+
+    Every contact is written as its last add/update entry, so the file has
+    the same layout as a delta and can seed a downstream system before it
+    switches to deltas from the returned checkpoint.
+    """
+    fmt = delta_format(path)
+    checkpoint = journal.last_seq
+    live = journal.live_entries()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        count = write_delta(live, f, fmt)
+    return count, checkpoint
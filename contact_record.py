@@ -0,0 +1,132 @@
+import sys
+from calendar import timegm
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Fields every record has a slot for, in export order
+FIELDS = ('id', 'name', 'email', 'company', 'position', 'source', 'language', 'custom_message', 'date_added')
+
+# Low-cardinality fields whose strings are interned, so equal values share one object
+INTERNED_FIELDS = frozenset(('company', 'language', 'source'))
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(value):
+    """Seconds since 1970-01-01 of a date_added value (naive, wall-clock time)
+
+    Accepts epochs, datetimes (including pandas Timestamps) and ISO strings
+    such as '2024-01-31 09:30:00'; anything else is returned unchanged so
+    no imported value is lost.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, datetime):
+        # NaT is a datetime that is not equal to itself
+        return timegm(value.timetuple()) if value == value else None
+    if isinstance(value, str):
+        try:
+            return timegm(datetime.fromisoformat(value.strip()).timetuple())
+        except ValueError:
+            return value
+    return value
+
+
+def from_epoch(value):
+    """datetime of a date_added epoch"""
+    return EPOCH + timedelta(seconds=value)
+
+
+def format_epoch(value):
+    """date_added as displayed and exported: 'YYYY-MM-DD HH:MM:SS' for epochs"""
+    if isinstance(value, int):
+        return from_epoch(value).strftime(DATE_FORMAT)
+    return value
+
+
+def now_epoch():
+    """Current wall-clock time as a date_added epoch"""
+    return timegm(datetime.now().timetuple())
+
+
+class ContactRecord(MutableMapping):
+    """One contact, stored in slots instead of a per-contact dict
+
+    company, language and source are interned and date_added is kept as an
+    integer epoch, formatted only when read. The record behaves like the
+    dict it replaces (contact['email'], .get(), .items(), dict(contact)):
+    missing fields read as absent, and keys outside FIELDS (extra columns
+    of an imported file) go to a small overflow dict.
+    """
+
+    __slots__ = ('id', 'name', 'email', 'company', 'position', 'source', 'language', 'custom_message',
+                 'date_epoch', 'extra')
+
+    def __init__(self, contact=(), **fields):
+        for slot in self.__slots__:
+            setattr(self, slot, None)
+        for key, value in dict(contact, **fields).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key == 'date_added':
+            value = format_epoch(self.date_epoch)
+        elif key in FIELDS:
+            value = getattr(self, key)
+        else:
+            value = (self.extra or {}).get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key == 'date_added':
+            self.date_epoch = to_epoch(value)
+        elif key in FIELDS:
+            if key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        self[key]  # KeyError if absent
+        if key == 'date_added':
+            self.date_epoch = None
+        elif key in FIELDS:
+            setattr(self, key, None)
+        else:
+            del self.extra[key]
+
+    def __iter__(self):
+        for field in FIELDS:
+            if (self.date_epoch if field == 'date_added' else getattr(self, field)) is not None:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ContactRecord({dict(self)!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, MutableMapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def get(self, key, default=None):
+        # Faster than the Mapping default, which goes through a KeyError
+        if key in FIELDS and key != 'date_added':
+            value = getattr(self, key)
+        else:
+            try:
+                return self[key]
+            except KeyError:
+                return default
+        return default if value is None else value
@@ -0,0 +1,259 @@
+from collections import deque
+
+from contact_journal import ADD, DELETE, UPDATE
+from contact_record import ContactRecord
+from name_normalizer import normalize_name
+from search_index import TrigramIndex
+
+DUPLICATE_POLICIES = ('reject', 'skip', 'merge')
+
+# Recent changes remembered for changed_since(), so views can catch up instead of rebuilding
+CHANGE_LOG_SIZE = 10_000
+
+
+class DuplicateContactError(ValueError):
+    """Raised when adding a contact that is already in the store"""
+
+    def __init__(self, existing):
+        self.existing = existing
+        super().__init__(f"Contact already exists: {existing.get('name')} - {existing.get('email')}")
+
+
+def email_key(email):
+    """Normalized email used for duplicate detection (None if missing)"""
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return email.strip().lower()
+
+
+def name_company_key(name, company):
+    """Normalized (name, company) pair used for duplicate detection (None if missing)"""
+    if not isinstance(name, str) or not isinstance(company, str):
+        return None
+    name = normalize_name(name)
+    company = company.strip().casefold()
+    if not name or not company:
+        return None
+    return name, company
+
+
+def is_empty(value):
+    """True for blank strings, None and NaN (as produced by pandas imports)"""
+    return value is None or value == '' or value != value
+
+
+class ContactStore:
+    """Contacts keyed by a stable ID, with hash indexes for O(1) duplicate checks
+
+    Contacts are stored as compact ContactRecords (dict-like, with an 'id'
+    key) kept in insertion order.
+    Two indexes map the normalized email and the normalized (name, company)
+    pair to the contact ID, so duplicates are detected on insert without
+    scanning the list. A trigram index over name, company and email is kept
+    up to date on every insert, merge and delete to serve search().
+    `version` increases on every change, so derived data (exports, views)
+    can be cached against it, and changed_since() tells which contacts a
+    recent change touched, so such data can be updated in place.
+
+    With a ContactJournal, the store starts from the contacts it records
+    (keeping their IDs) and appends every add, merge and delete to it.
+    """
+
+    def __init__(self, contacts=None, on_duplicate='merge', journal=None):
+        self._contacts = {}
+        self._by_email = {}
+        self._by_name_company = {}
+        self._search_index = TrigramIndex()
+        self._next_id = 1
+        self.version = 0
+        self._changes = deque()    # (version, contact ID) of the latest changes, oldest first
+        self._changes_from = 0     # oldest version changed_since() can answer for
+        self.journal = None
+        if journal is not None:
+            self._restore(journal.contacts(), journal.max_id)
+            self.journal = journal
+        if contacts:
+            self.add_many(contacts, on_duplicate=on_duplicate)
+
+    def __len__(self):
+        return len(self._contacts)
+
+    def __iter__(self):
+        return iter(self._contacts.values())
+
+    def __contains__(self, contact_id):
+        return contact_id in self._contacts
+
+    def get(self, contact_id):
+        """Return the contact with this ID, or None"""
+        return self._contacts.get(contact_id)
+
+    def find_by_email(self, email):
+        """Return the contact with this email (case-insensitive), or None"""
+        contact_id = self._by_email.get(email_key(email))
+        return self._contacts.get(contact_id)
+
+    def find(self, name, company):
+        """Return the contact with this name at this company, or None"""
+        contact_id = self._by_name_company.get(name_company_key(name, company))
+        return self._contacts.get(contact_id)
+
+    def find_duplicate(self, contact):
+        """Return the stored contact matching this one by email or by name and company"""
+        return self.find_by_email(contact.get('email')) or self.find(contact.get('name'), contact.get('company'))
+
+    def search(self, query=""):
+        """Contacts whose name, company or email contains query (case-insensitive)"""
+        if not query:
+            return list(self._contacts.values())
+        return [self._contacts[contact_id] for contact_id in self._search_index.search(query)]
+
+    def add(self, contact, on_duplicate='reject'):
+        """Insert a contact and return the stored copy
+
+        on_duplicate decides what happens when the email or the (name, company)
+        pair is already known: 'reject' raises DuplicateContactError, 'skip'
+        returns the existing contact unchanged and 'merge' fills its empty
+        fields from the new one.
+        """
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"on_duplicate must be one of {DUPLICATE_POLICIES}, got '{on_duplicate}'")
+
+        existing = self.find_duplicate(contact)
+        if existing is not None:
+            if on_duplicate == 'reject':
+                raise DuplicateContactError(existing)
+            if on_duplicate == 'merge':
+                self._merge(existing, contact)
+            return existing
+
+        contact = ContactRecord(contact)
+        contact['id'] = self._next_id
+        self._next_id += 1
+        self._contacts[contact['id']] = contact
+        self._index(contact)
+        self._changed([contact['id']])
+        if self.journal is not None:
+            self.journal.append(ADD, contact['id'], contact)
+        return contact
+
+    def add_many(self, contacts, on_duplicate='merge'):
+        """Insert several contacts, returning (added, duplicates) counts"""
+        added = duplicates = 0
+        for contact in contacts:
+            before = len(self._contacts)
+            self.add(contact, on_duplicate=on_duplicate)
+            if len(self._contacts) > before:
+                added += 1
+            else:
+                duplicates += 1
+        return added, duplicates
+
+    def remove(self, contact_id):
+        """Delete a contact by ID and return it"""
+        contact = self._contacts.pop(contact_id)
+        self._unindex(contact)
+        self._changed([contact_id])
+        if self.journal is not None:
+            self.journal.append(DELETE, contact_id)
+        return contact
+
+    def remove_many(self, contact_ids):
+        """Delete several contacts by ID in one operation, returning how many were removed
+
+        Unknown IDs are ignored. The lookup and search indexes are updated
+        for the removed contacts only.
+        """
+        removed = []
+        for contact_id in contact_ids:
+            contact = self._contacts.pop(contact_id, None)
+            if contact is not None:
+                self._unindex(contact)
+                removed.append(contact_id)
+                if self.journal is not None:
+                    self.journal.append(DELETE, contact_id)
+        if removed:
+            self._changed(removed)
+        return len(removed)
+
+    def clear(self):
+        """Delete every contact (IDs are not reused)"""
+        if self.journal is not None:
+            for contact_id in self._contacts:
+                self.journal.append(DELETE, contact_id)
+        self._contacts.clear()
+        self._by_email.clear()
+        self._by_name_company.clear()
+        self._search_index.clear()
+        self._changed(None)
+
+    def _merge(self, existing, contact):
+        """Fill the empty fields of an existing contact from a duplicate
+
+        A duplicate that brings nothing new changes nothing: no version
+        bump and no journal entry, so re-importing the same file is free.
+        """
+        filled = {
+            field: value for field, value in contact.items()
+            if field != 'id' and is_empty(existing.get(field)) and not is_empty(value)
+        }
+        if not filled:
+            return
+        self._unindex(existing)
+        for field, value in filled.items():
+            existing[field] = value
+        self._index(existing)
+        self._changed([existing['id']])
+        if self.journal is not None:
+            self.journal.append(UPDATE, existing['id'], existing)
+
+    def _restore(self, contacts, max_id=0):
+        """Load contacts that already have IDs (e.g. replayed from a journal)"""
+        for contact in contacts:
+            contact = ContactRecord(contact)
+            self._contacts[contact['id']] = contact
+            self._index(contact)
+            max_id = max(max_id, contact['id'])
+        self._next_id = max_id + 1
+        self._changed(None)
+
+    def _changed(self, contact_ids):
+        """Bump the version, logging the contacts touched (None: too many to list)"""
+        self.version += 1
+        if contact_ids is None:
+            self._changes.clear()
+            self._changes_from = self.version
+            return
+        self._changes.extend((self.version, contact_id) for contact_id in contact_ids)
+        while len(self._changes) > CHANGE_LOG_SIZE:
+            # Part of that version's changes is forgotten, so it can no longer be answered for
+            self._changes_from = self._changes.popleft()[0]
+
+    def changed_since(self, version):
+        """IDs of the contacts added, changed or deleted after a version, or None if no longer known"""
+        if not self._changes_from <= version <= self.version:
+            return None
+        contact_ids = set()
+        for changed, contact_id in reversed(self._changes):
+            if changed <= version:
+                break
+            contact_ids.add(contact_id)
+        return contact_ids
+
+    def _index(self, contact):
+        key = email_key(contact.get('email'))
+        if key is not None:
+            self._by_email.setdefault(key, contact['id'])
+        key = name_company_key(contact.get('name'), contact.get('company'))
+        if key is not None:
+            self._by_name_company.setdefault(key, contact['id'])
+        self._search_index.add(contact['id'], contact)
+
+    def _unindex(self, contact):
+        key = email_key(contact.get('email'))
+        if self._by_email.get(key) == contact['id']:
+            del self._by_email[key]
+        key = name_company_key(contact.get('name'), contact.get('company'))
+        if self._by_name_company.get(key) == contact['id']:
+            del self._by_name_company[key]
+        self._search_index.remove(contact['id'])
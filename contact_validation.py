@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from metrics import instrumented
+
+# Loose RFC 5322 address check: a dot-atom local part and a domain of dotted DNS labels
+EMAIL_PATTERN = (
+    r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)+"
+)
+
+# Language codes contacts can have, and the one given to rows without a language
+LANGUAGES = ('fr', 'en', 'es', 'de', 'it')
+DEFAULT_LANGUAGE = 'fr'
+
+# Spellings of each language accepted on import, besides the code itself
+LANGUAGE_ALIASES = {
+    'french': 'fr', 'français': 'fr', 'francais': 'fr', 'fra': 'fr', 'fre': 'fr',
+    'english': 'en', 'anglais': 'en', 'eng': 'en',
+    'spanish': 'es', 'espagnol': 'es', 'español': 'es', 'espanol': 'es', 'spa': 'es',
+    'german': 'de', 'allemand': 'de', 'deutsch': 'de', 'deu': 'de', 'ger': 'de',
+    'italian': 'it', 'italien': 'it', 'italiano': 'it', 'ita': 'it',
+}
+
+# Text fields whose inner runs of whitespace are collapsed to one space
+SINGLE_LINE_FIELDS = ('name', 'company', 'position', 'source')
+
+# Text fields that are only trimmed (line breaks in messages are kept)
+MULTI_LINE_FIELDS = ('custom_message',)
+
+
+def clean_text(column):
+    """Trimmed string column with '' for missing values, whatever the column held"""
+    return column.where(column.notna(), '').astype(str).str.strip()
+
+
+def collapse_whitespace(column):
+    return column.str.replace(r'\s+', ' ', regex=True)
+
+
+def normalize_language(column):
+    """Lowercase language codes, with aliases, regions ('fr-FR') and blanks resolved"""
+    column = clean_text(column).str.lower()
+    column = column.str.replace(r'[-_].*$', '', regex=True)
+    column = column.replace(LANGUAGE_ALIASES)
+    return column.where(column != '', DEFAULT_LANGUAGE)
+
+
+def parse_dates(column):
+    """(dates, numeric) of a date column: naive Timestamps (NaT if unparseable) and where it held numbers
+
+    ISO dates ('2024-01-31 09:30:00') are read first; any other spelling
+    is read day first, as French exports write them ('01/02/2024' is
+    1 February), never month first. Values with a UTC offset are
+    converted to UTC, so a column mixing offsets and naive times parses
+    instead of raising. Numbers (Excel serials, epoch seconds) are
+    ambiguous, so they are not parsed but flagged in numeric.
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        if column.dt.tz is not None:
+            column = column.dt.tz_convert('UTC').dt.tz_localize(None)
+        return column, pd.Series(False, index=column.index)
+    numeric = pd.to_numeric(column, errors='coerce').notna()
+    values = column.where(~numeric, None)
+    dates = pd.to_datetime(values, errors='coerce', format='ISO8601', utc=True)
+    # dayfirst also applies to ISO dates ('2024-01-02' would become 1 February), so only the rest get it
+    rest = dates.isna() & values.notna()
+    if rest.any():
+        dates = dates.where(~rest, pd.to_datetime(values[rest], errors='coerce', format='mixed', dayfirst=True, utc=True))
+    return dates.dt.tz_localize(None), numeric
+
+
+class ContactValidator:
+    """Checks and normalizes imported chunks column by column
+
+    validate() takes a DataFrame chunk and returns (valid, rejected): the
+    valid rows normalized (trimmed text, collapsed whitespace, lowercase
+    emails, canonical company names, language codes, date_added as
+    Timestamps) and the rejected rows as they were read, with a 'reason'
+    column listing every problem found. Every check is a vectorized
+    operation over a whole column, so a chunk is validated in one pass per
+    field instead of one Python call per row.
+
+    Companies are matched case-insensitively against company_formats, the
+    names of the registry the contacts' emails come from.
+    """
+
+    def __init__(self, company_formats, languages=LANGUAGES):
+        self.companies = pd.Series(list(company_formats), dtype=object)
+        self.companies.index = self.companies.str.casefold()
+        self.companies = self.companies[~self.companies.index.duplicated()]
+        self.languages = list(languages)
+
+    @instrumented('validate_contacts')
+    def validate(self, df, now=None):
+        """(valid, rejected) rows of a chunk; blank dates become now (default: the current time)"""
+        clean = df.copy()
+        problems = []
+
+        for field in SINGLE_LINE_FIELDS + MULTI_LINE_FIELDS:
+            if field in clean.columns:
+                clean[field] = clean_text(clean[field])
+                if field in SINGLE_LINE_FIELDS:
+                    clean[field] = collapse_whitespace(clean[field])
+            else:
+                clean[field] = ''
+
+        problems.append((clean['name'] == '', "missing name"))
+
+        email = clean_text(clean['email']).str.lower() if 'email' in clean.columns else pd.Series('', index=df.index)
+        problems.append((email == '', "missing email"))
+        problems.append(((email != '') & ~email.str.fullmatch(EMAIL_PATTERN).fillna(False), "invalid email"))
+        clean['email'] = email
+
+        company = clean['company'].str.casefold().map(self.companies)
+        problems.append((clean['company'] == '', "missing company"))
+        problems.append(((clean['company'] != '') & company.isna(), "unknown company"))
+        clean['company'] = company.where(company.notna(), clean['company'])
+
+        language = normalize_language(clean['language']) if 'language' in clean.columns \
+            else pd.Series(DEFAULT_LANGUAGE, index=df.index)
+        problems.append((~language.isin(self.languages), "unknown language"))
+        clean['language'] = language
+
+        if 'date_added' in clean.columns:
+            raw = clean['date_added']
+            blank = raw.isna() | (raw.astype(str).str.strip() == '')
+            dates, numeric = parse_dates(raw.where(~blank, None))
+            problems.append((~blank & numeric, "invalid date_added (a number, not a date)"))
+            problems.append((~blank & ~numeric & dates.isna(), "invalid date_added"))
+            clean['date_added'] = dates.where(~blank, pd.Timestamp(now or datetime.now()).floor('s'))
+        else:
+            clean['date_added'] = pd.Timestamp(now or datetime.now()).floor('s')
+
+        rejected = np.zeros(len(df), dtype=bool)
+        for mask, _ in problems:
+            rejected |= mask.to_numpy(dtype=bool)
+        if not rejected.any():
+            return clean, df.iloc[:0].assign(reason=pd.Series(dtype=object))
+
+        # Reasons are only spelled out for the rejected rows
+        reasons = np.full(int(rejected.sum()), '', dtype=object)
+        for mask, reason in problems:
+            hit = mask.to_numpy(dtype=bool)[rejected]
+            reasons[hit] = reasons[hit] + np.where(reasons[hit] == '', reason, '; ' + reason)
+        return clean[~rejected], df[rejected].assign(reason=reasons)
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# Columns of the contacts table, in display order
+DISPLAY_COLUMNS = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message', 'date_added']
+
+# Low-cardinality columns stored as categoricals
+CATEGORY_COLUMNS = ('language', 'company', 'source')
+
+
+def contacts_frame(contacts):
+    """Contacts as a typed DataFrame indexed by contact ID"""
+    df = pd.DataFrame.from_records(list(contacts), columns=['id'] + DISPLAY_COLUMNS, index='id')
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype('category')
+    df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
+    return df
+
+
+def append_rows(df, rows):
+    """df with the rows of another contacts frame added, keeping the categorical columns categorical"""
+    rows = rows.copy()
+    df = df.copy()
+    for column in CATEGORY_COLUMNS:
+        categories = df[column].cat.categories.union(rows[column].cat.categories)
+        df[column] = df[column].cat.set_categories(categories)
+        rows[column] = rows[column].cat.set_categories(categories)
+    rows['date_added'] = rows['date_added'].astype(df['date_added'].dtype)
+    return pd.concat([df, rows]) if len(df) else rows
+
+
+def sort_keys(column):
+    """Case-insensitive sort keys of a contacts column as an array, and a mask of its missing or blank values"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        keys = column.to_numpy()
+    else:
+        # Mapping a categorical only maps its categories, so '' is turned missing there too
+        keys = column.map(lambda value: value.casefold() if isinstance(value, str) and value else None)
+        keys = keys.to_numpy(dtype=object)
+    return keys, pd.isna(keys)
+
+
+class SortOrder:
+    """Contact IDs in ascending order of one column, kept sorted as contacts come and go
+
+    ids and keys are the contacts that have a value, in ascending key
+    order; missing holds the contacts without one, which always come last.
+    """
+
+    def __init__(self, column):
+        keys, missing = sort_keys(column)
+        ids = column.index.to_numpy()
+        order = np.argsort(keys[~missing], kind='stable')
+        self.ids = ids[~missing][order]
+        self.keys = keys[~missing][order]
+        self.missing = ids[missing]
+
+    def remove(self, contact_ids):
+        kept = ~np.isin(self.ids, contact_ids)
+        self.ids, self.keys = self.ids[kept], self.keys[kept]
+        self.missing = self.missing[~np.isin(self.missing, contact_ids)]
+
+    def insert(self, column):
+        """Merge the contacts of a (small) column into the order"""
+        new = SortOrder(column)
+        positions = np.searchsorted(self.keys, new.keys, side='right')
+        self.ids = np.insert(self.ids, positions, new.ids)
+        self.keys = np.insert(self.keys, positions, new.keys)
+        self.missing = np.concatenate([self.missing, new.missing])
+
+    def view(self, descending=False):
+        """All contact IDs in display order; missing values stay at the end either way"""
+        return np.concatenate([self.ids[::-1] if descending else self.ids, self.missing])
+
+
+class ContactsView:
+    """A store's contacts as a DataFrame and sort orders, updated in place as the store changes
+
+    refresh() brings the view up to date with the store. When the store
+    can tell which contacts changed since the view's version
+    (ContactStore.changed_since), only those rows are dropped or rebuilt
+    and their IDs removed from or merged into each sort order: adding or
+    deleting a few contacts costs a few array copies, not a new frame and
+    a new sort of every column. Otherwise (an SQLite store, a bulk change
+    the store no longer remembers) the frame is rebuilt and the orders
+    are recomputed on first use.
+
+    Each session owns its view, so sessions do not evict each other's.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.version = None
+        self.frame = None
+        self._orders = {}
+        self._last_view = None
+
+    def refresh(self):
+        """Catch up with the store; returns the (read-only) frame"""
+        version = self.store.version
+        if version == self.version:
+            return self.frame
+        changed_since = getattr(self.store, 'changed_since', None)
+        changed = changed_since(self.version) if changed_since is not None and self.version is not None else None
+        if changed is None:
+            self.frame = contacts_frame(self.store)
+            self._orders = {}
+        else:
+            self._update(changed)
+        self.version = version
+        self._last_view = None
+        return self.frame
+
+    def _update(self, contact_ids):
+        contact_ids = np.fromiter(contact_ids, dtype=np.int64, count=len(contact_ids))
+        contacts = [self.store.get(contact_id) for contact_id in contact_ids.tolist()]
+        rows = contacts_frame(contact for contact in contacts if contact is not None)
+        frame = self.frame[~self.frame.index.isin(contact_ids)]
+        self.frame = append_rows(frame, rows)
+        for column, order in self._orders.items():
+            order.remove(contact_ids)
+            order.insert(rows[column])
+
+    def order(self, column, descending=False, query='', matches=None):
+        """Contact IDs in display order, restricted to matches (the IDs found for query) when searching
+
+        The last result is kept, so page turns reuse it.
+        """
+        key = (self.version, column, descending, query)
+        if self._last_view is not None and self._last_view[0] == key:
+            return self._last_view[1]
+        if column not in self._orders:
+            self._orders[column] = SortOrder(self.frame[column])
+        ids = self._orders[column].view(descending)
+        if query:
+            ids = ids[np.isin(ids, matches)]
+        self._last_view = (key, ids)
+        return ids
@@ -0,0 +1,78 @@
+import string
+
+# Format patterns: {f} = first name, {l} = last name, {fi} = first initial, {li} = last initial
+PLACEHOLDERS = ('f', 'l', 'fi', 'li')
+
+# How each placeholder is derived from the cleaned first/last names
+_FIELD_VALUES = {
+    'f': lambda first, last: first,
+    'l': lambda first, last: last,
+    'fi': lambda first, last: first[:1],
+    'li': lambda first, last: last[:1],
+}
+
+
+class EmailFormat:
+    """A company email pattern compiled once into a specialized renderer
+
+    Parsing and validation happen here, so a bad pattern is rejected when it
+    enters the registry; render() then only computes the placeholders the
+    pattern actually uses and fills a %-template.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.parts = parse_format(pattern)
+        self.fields = tuple(field for _, field in self.parts if field is not None)
+        self.template = ''.join(
+            literal.replace('%', '%%') + ('%s' if field is not None else '')
+            for literal, field in self.parts
+        )
+        self.render = self._build_renderer()
+
+    def _build_renderer(self):
+        """Pick the cheapest renderer for the placeholders in use"""
+        template = self.template
+        if self.fields == ('f', 'l'):
+            return lambda first, last: template % (first, last)
+        if self.fields == ('fi', 'l'):
+            return lambda first, last: template % (first[:1], last)
+        if self.fields == ('f',):
+            return lambda first, last: template % first
+        if not self.fields:
+            return lambda first, last: template
+        getters = [_FIELD_VALUES[field] for field in self.fields]
+        return lambda first, last: template % tuple(get(first, last) for get in getters)
+
+    def __repr__(self):
+        return f"EmailFormat({self.pattern!r})"
+
+
+def parse_format(pattern):
+    """Split a pattern into (literal, field) parts, raising ValueError if invalid"""
+    if not isinstance(pattern, str):
+        raise ValueError(f"Email format must be a string, got {type(pattern).__name__}")
+
+    try:
+        parsed = list(string.Formatter().parse(pattern))
+    except ValueError as e:
+        raise ValueError(f"Invalid email format '{pattern}': {e}") from None
+
+    parts = []
+    for literal, field, spec, conversion in parsed:
+        if field is not None:
+            if field not in PLACEHOLDERS:
+                raise ValueError(
+                    f"Invalid email format '{pattern}': unknown placeholder {{{field}}} "
+                    f"(use {', '.join('{' + p + '}' for p in PLACEHOLDERS)})"
+                )
+            if spec or conversion:
+                raise ValueError(f"Invalid email format '{pattern}': placeholders take no format options")
+        parts.append((literal, field))
+
+    # The domain must be fixed text after the last placeholder
+    tail = parts[-1][0] if parts and parts[-1][1] is None else ''
+    if '@' not in tail or not tail.split('@')[-1]:
+        raise ValueError(f"Invalid email format '{pattern}': expected a fixed domain such as '@company.com'")
+
+    return parts
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import os
+import secrets
+import socket
+import time
+from collections import defaultdict
+
+# Verdicts of a verification
+VALID = 'valid'            # the server accepted RCPT TO
+INVALID = 'invalid'        # the server permanently rejected RCPT TO (5xx)
+CATCH_ALL = 'catch-all'    # the domain accepts any address, so acceptance proves nothing
+UNKNOWN = 'unknown'        # temporary failure, greylisting or no reachable server
+
+# Known answers are reused for a day; unknown results are never cached
+DEFAULT_TTL = 24 * 3600
+
+# Recipients checked per MAIL FROM transaction (servers often cap RCPTs at 100)
+RCPTS_PER_TRANSACTION = 50
+
+try:
+    import dns.asyncresolver
+except ImportError:  # dnspython is optional
+    dns = None
+
+
+async def default_resolver(domain):
+    """Mail servers of a domain, by MX preference
+
+    Uses dnspython when it is installed; otherwise (or when the domain has
+    no MX record) falls back to the domain itself, as RFC 5321 prescribes.
+    """
+    if dns is not None:
+        try:
+            answer = await dns.asyncresolver.resolve(domain, 'MX')
+            records = sorted(answer, key=lambda record: record.preference)
+            hosts = [str(record.exchange).rstrip('.') for record in records]
+            if hosts:
+                return hosts
+        except Exception:
+            pass
+    return [domain]
+
+
+class VerificationCache:
+    """Verdicts per address (and catch-all flags per domain) that expire after ttl seconds
+
+    Can be saved to and loaded from a JSON file so repeated runs skip known
+    answers.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, clock=time.time):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        verdict, expires = entry
+        if expires <= self.clock():
+            del self._entries[key]
+            return None
+        return verdict
+
+    def set(self, key, verdict):
+        if verdict != UNKNOWN:
+            self._entries[key] = (verdict, self.clock() + self.ttl)
+
+    def get_catch_all(self, domain):
+        return self.get(f"*@{domain}")
+
+    def set_catch_all(self, domain, catch_all):
+        self.set(f"*@{domain}", catch_all)
+
+    def save(self, path):
+        now = self.clock()
+        entries = {key: entry for key, entry in self._entries.items() if entry[1] > now}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+
+    @classmethod
+    def load(cls, path, ttl=DEFAULT_TTL, clock=time.time):
+        cache = cls(ttl, clock)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                cache._entries = {key: tuple(entry) for key, entry in json.load(f).items()}
+        return cache
+
+
+class SMTPError(Exception):
+    """Unexpected reply or broken connection during an SMTP dialogue"""
+
+
+class SMTPSession:
+    """Minimal SMTP client: just enough of the dialogue to ask RCPT TO questions"""
+
+    def __init__(self, reader, writer, timeout):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+
+    async def reply(self):
+        """Read a (possibly multi-line) reply, returning its code"""
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if len(line) < 4 or not line[:3].isdigit():
+                raise SMTPError(f"Malformed reply: {line!r}")
+            if line[3:4] != b'-':
+                return int(line[:3])
+
+    async def command(self, line):
+        self.writer.write(line.encode('ascii', 'replace') + b'\r\n')
+        await self.writer.drain()
+        return await self.reply()
+
+    async def start(self, helo_name, sender):
+        """Read the greeting, identify ourselves and open a transaction"""
+        if await self.reply() != 220:
+            raise SMTPError("Server refused the connection")
+        if await self.command(f"EHLO {helo_name}") != 250 and await self.command(f"HELO {helo_name}") != 250:
+            raise SMTPError("Server refused EHLO/HELO")
+        await self.mail_from(sender)
+
+    async def mail_from(self, sender):
+        if await self.command(f"MAIL FROM:<{sender}>") != 250:
+            raise SMTPError("Server refused MAIL FROM")
+
+    async def rcpt(self, address):
+        return await self.command(f"RCPT TO:<{address}>")
+
+    async def reset(self, sender):
+        """Start a new transaction on the same connection"""
+        await self.command("RSET")
+        await self.mail_from(sender)
+
+    async def close(self):
+        try:
+            await self.command("QUIT")
+        except (SMTPError, OSError, asyncio.TimeoutError):
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+
+def rcpt_verdict(code):
+    if code in (250, 251):
+        return VALID
+    if 500 <= code < 600:
+        return INVALID
+    return UNKNOWN
+
+
+class EmailVerifier:
+    """Checks whether mail servers accept generated addresses, without sending mail
+
+    Addresses are grouped by domain and each domain is checked over at most
+    per_domain connections, each reused for many RCPT TO commands; no more
+    than max_connections are open at once overall. Before its first
+    recipient, every domain is probed with a random address on the first
+    of its connections, the others opening only once the answer is in: a
+    server that accepts it is a catch-all, and its addresses are reported
+    as such without further questions. Verdicts and catch-all flags go through a
+    VerificationCache.
+
+    resolver(domain) -> [hosts] and connect(host, port) -> (reader, writer)
+    are coroutines and can be replaced, e.g. to talk to a local test server.
+    """
+
+    def __init__(self, resolver=None, connect=None, port=25, sender='', helo_name=None,
+                 max_connections=20, per_domain=1, timeout=10.0, cache=None):
+        self.resolver = resolver or default_resolver
+        self.connect = connect or asyncio.open_connection
+        self.port = port
+        self.sender = sender
+        self.helo_name = helo_name or socket.getfqdn()
+        self.max_connections = max_connections
+        self.per_domain = per_domain
+        self.timeout = timeout
+        self.cache = cache if cache is not None else VerificationCache()
+
+    async def verify_many(self, emails):
+        """Return {email: verdict} for an iterable of addresses"""
+        results = {}
+        by_domain = defaultdict(list)
+        for email in dict.fromkeys(emails):
+            local, _, domain = email.rpartition('@')
+            if not local or not domain:
+                results[email] = INVALID
+                continue
+            domain = domain.lower()
+            known = self.cache.get(email) or (CATCH_ALL if self.cache.get_catch_all(domain) == CATCH_ALL else None)
+            if known is not None:
+                results[email] = known
+            else:
+                by_domain[domain].append(email)
+
+        slots = asyncio.Semaphore(self.max_connections)
+        await asyncio.gather(*(
+            self._verify_domain(domain, addresses, slots, results) for domain, addresses in by_domain.items()
+        ))
+        return results
+
+    async def _verify_domain(self, domain, addresses, slots, results):
+        try:
+            hosts = await asyncio.wait_for(self.resolver(domain), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            hosts = []
+        if not hosts:
+            results.update(dict.fromkeys(addresses, UNKNOWN))
+            return
+
+        # The first connection asks the catch-all question, then goes on with its
+        # share of the addresses; the others only start once it has the answer
+        connections = max(1, min(self.per_domain, len(addresses)))
+        probed = asyncio.Event()
+        await asyncio.gather(*(
+            self._session(domain, hosts, addresses[i::connections], slots, results, probed, probe=i == 0)
+            for i in range(connections)
+        ))
+
+    async def _session(self, domain, hosts, addresses, slots, results, probed, probe=False):
+        """Check addresses over one connection to the first reachable host
+
+        The probe session sets probed once the catch-all question is
+        settled (or could not be asked); the other sessions wait for it and
+        connect only if the domain is not a catch-all.
+        """
+        if not probe:
+            await probed.wait()
+            if self.cache.get_catch_all(domain) == CATCH_ALL:
+                results.update(dict.fromkeys(addresses, CATCH_ALL))
+                return
+        try:
+            await self._check(domain, hosts, addresses, slots, results, probed if probe else None)
+        finally:
+            if probe:
+                probed.set()
+
+    async def _check(self, domain, hosts, addresses, slots, results, probed=None):
+        """Connect and check addresses, probing for a catch-all first when given the probed event"""
+        async with slots:
+            session = None
+            for host in hosts:
+                try:
+                    reader, writer = await asyncio.wait_for(self.connect(host, self.port), self.timeout)
+                    session = SMTPSession(reader, writer, self.timeout)
+                    await session.start(self.helo_name, self.sender)
+                    break
+                except (SMTPError, OSError, asyncio.TimeoutError):
+                    if session is not None:
+                        await session.close()
+                    session = None
+            if session is None:
+                results.update(dict.fromkeys(addresses, UNKNOWN))
+                return
+
+            checked = 0
+            try:
+                if probed is not None:
+                    verdict = rcpt_verdict(await session.rcpt(f"{secrets.token_hex(12)}@{domain}"))
+                    if verdict != UNKNOWN:
+                        self.cache.set_catch_all(domain, CATCH_ALL if verdict == VALID else 'no')
+                    probed.set()
+                    if verdict == VALID:
+                        results.update(dict.fromkeys(addresses, CATCH_ALL))
+                        return
+                for i, address in enumerate(addresses):
+                    if i and i % RCPTS_PER_TRANSACTION == 0:
+                        await session.reset(self.sender)
+                    verdict = rcpt_verdict(await session.rcpt(address))
+                    results[address] = verdict
+                    self.cache.set(address, verdict)
+                    checked += 1
+            except (SMTPError, OSError, asyncio.TimeoutError):
+                results.update(dict.fromkeys(addresses[checked:], UNKNOWN))
+            finally:
+                await session.close()
+
+
+def verify_emails(emails, verifier=None):
+    """Synchronous wrapper: {email: verdict} for an iterable of addresses"""
+    return asyncio.run((verifier or EmailVerifier()).verify_many(emails))
@@ -0,0 +1,136 @@
+import string
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from name_normalizer import normalize_name
+
+# Local-part patterns tested against known addresses, most common first
+CANDIDATE_PATTERNS = [
+    '{f}.{l}', '{fi}{l}', '{f}_{l}', '{f}{l}', '{f}-{l}', '{fi}.{l}',
+    '{l}.{f}', '{l}{f}', '{l}_{f}', '{l}{fi}', '{f}{li}', '{f}.{li}',
+    '{fi}{li}', '{f}', '{l}',
+]
+
+RESULT_COLUMNS = ['domain', 'format', 'support', 'rows', 'confidence', 'company']
+
+
+def as_strings(values):
+    """Arrow string array from a column (non-string values become null)"""
+    try:
+        return pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed column (numbers, dates...): only genuine strings are kept
+        return pa.array([value if isinstance(value, str) else None for value in values], type=pa.string())
+
+
+def split_in_two(values, first_part):
+    """(head, tail) of each string split once by first_part(values), null when there is no split"""
+    parts = first_part(values)
+    has_two = pc.equal(pc.list_value_length(parts), 2)
+    parts = pc.if_else(has_two, parts, pa.scalar(['', ''], type=parts.type))
+    return pc.list_element(parts, 0), pc.list_element(parts, 1), pc.fill_null(has_two, False)
+
+
+def normalize_names(values):
+    """normalize_name over an arrow column, computed once per distinct value"""
+    encoded = pc.dictionary_encode(values)
+    cleaned = pa.array([normalize_name(value) for value in encoded.dictionary.to_pylist()], type=pa.string())
+    return pc.fill_null(pc.take(cleaned, encoded.indices), '')
+
+
+def render_local_parts(local_pattern, fields):
+    """Render a local-part pattern over whole columns of placeholder values"""
+    pieces = []
+    for literal, field, _, _ in string.Formatter().parse(local_pattern):
+        if literal:
+            pieces.append(literal)
+        if field is not None:
+            pieces.append(fields[field])
+    return pc.binary_join_element_wise(*pieces, '')
+
+
+def infer_formats(contacts, patterns=CANDIDATE_PATTERNS, min_support=1):
+    """Propose an email format per domain from known (name, email, company) rows
+
+    Names and emails are split and normalized column-wise with Arrow compute
+    kernels (names once per distinct value). Every candidate pattern is then
+    rendered for all rows at once and compared with the actual local parts,
+    and the row x pattern matches are summed per domain with bincount. Names
+    are compared both normalized ("le-gall") and with hyphens/apostrophes
+    removed ("legall").
+
+    Returns a DataFrame with one row per domain: the dominant format, its
+    support (matching rows), the number of rows with a usable name for that
+    domain, the confidence (support / rows) and the most common company.
+    """
+    df = contacts if isinstance(contacts, pd.DataFrame) else pd.DataFrame(list(contacts))
+    if df.empty or not {'name', 'email'} <= set(df.columns):
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    email = pc.utf8_lower(pc.utf8_trim_whitespace(as_strings(df['email'])))
+    local, domain, has_domain = split_in_two(email, lambda a: pc.split_pattern(a, '@', max_splits=1))
+    names = pc.utf8_trim_whitespace(as_strings(df['name']))
+    first, last, has_last = split_in_two(names, lambda a: pc.utf8_split_whitespace(a, max_splits=1))
+    first, last = normalize_names(first), normalize_names(last)
+
+    usable = pc.and_(pc.and_(has_domain, has_last), pc.and_(pc.not_equal(first, ''), pc.not_equal(last, '')))
+    usable = pc.and_(usable, pc.not_equal(domain, ''))
+    if not pc.any(usable).as_py():
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    local, domain, first, last = (pc.filter(column, usable) for column in (local, domain, first, last))
+
+    compact_first = pc.replace_substring_regex(first, "['-]", '')
+    compact_last = pc.replace_substring_regex(last, "['-]", '')
+    variants = [
+        {'f': f, 'l': l, 'fi': pc.utf8_slice_codeunits(f, 0, 1), 'li': pc.utf8_slice_codeunits(l, 0, 1)}
+        for f, l in ((first, last), (compact_first, compact_last))
+    ]
+
+    domain_encoded = pc.dictionary_encode(domain)
+    domain_codes = domain_encoded.indices.to_numpy()
+    domains = domain_encoded.dictionary.to_numpy(zero_copy_only=False)
+    rows = np.bincount(domain_codes, minlength=len(domains))
+
+    # support[d, p]: rows of domain d whose address matches pattern p
+    support = np.empty((len(domains), len(patterns)), dtype=np.int64)
+    for p, pattern in enumerate(patterns):
+        matched = np.zeros(len(domain_codes), dtype=bool)
+        for fields in variants:
+            same = pc.fill_null(pc.equal(render_local_parts(pattern, fields), local), False)
+            matched |= same.to_numpy(zero_copy_only=False)
+        support[:, p] = np.bincount(domain_codes, weights=matched, minlength=len(domains))
+
+    best = support.argmax(axis=1)
+    result = pd.DataFrame({
+        'domain': domains,
+        'format': [f"{patterns[p]}@{d}" for p, d in zip(best, domains)],
+        'support': support[np.arange(len(domains)), best],
+        'rows': rows,
+    })
+    result['confidence'] = result['support'] / result['rows']
+    result['company'] = top_company(df, usable, domain_codes, len(domains))
+
+    result = result[result['support'] >= max(min_support, 1)]
+    result = result.sort_values(['support', 'domain'], ascending=[False, True])
+    return result[RESULT_COLUMNS].reset_index(drop=True)
+
+
+def top_company(df, usable, domain_codes, n_domains):
+    """Most common company value per domain code (None if there is none)"""
+    if 'company' not in df.columns:
+        return [None] * n_domains
+    companies = pc.filter(as_strings(df['company']), usable)
+    encoded = pc.dictionary_encode(companies)
+    company_codes = pc.fill_null(encoded.indices, -1).to_numpy()
+    names = encoded.dictionary.to_pylist()
+    if not names:
+        return [None] * n_domains
+
+    known = company_codes >= 0
+    counts = np.bincount(
+        domain_codes[known] * len(names) + company_codes[known], minlength=n_domains * len(names)
+    ).reshape(n_domains, len(names))
+    return [names[c] if counts[d, c] else None for d, c in enumerate(counts.argmax(axis=1))]
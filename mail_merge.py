@@ -0,0 +1,338 @@
+import csv
+import functools
+import json
+import os
+import re
+import string
+import time
+from email import base64mime, policy
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, parseaddr
+
+from contact_export import cell_value
+from contact_import import iter_chunks
+from contact_store import is_empty
+from metrics import instrumented
+
+# Placeholders a template can use: the contact fields plus first/last name split from 'name'
+TEMPLATE_FIELDS = (
+    'name', 'first_name', 'last_name', 'email', 'company', 'position', 'source', 'language',
+    'custom_message', 'date_added',
+)
+
+# Templates used when none are given: {language: {'subject': ..., 'body': ...}}
+DEFAULT_TEMPLATES = {
+    'fr': {
+        'subject': "Prise de contact – {company}",
+        'body': "Bonjour {first_name},\n\n{custom_message}\n\nBien cordialement,\n",
+    },
+    'en': {
+        'subject': "Reaching out – {company}",
+        'body': "Hello {first_name},\n\n{custom_message}\n\nBest regards,\n",
+    },
+}
+
+# Columns of the rejection report
+REPORT_COLUMNS = ['row', 'id', 'name', 'email', 'language', 'reason']
+
+# UTF-8 bytes per RFC 2047 encoded word, so each stays within 75 characters once base64-encoded
+ENCODED_WORD_BYTES = 45
+
+# Longest body line sent as is (RFC 5322 allows 998 characters); longer bodies are base64-encoded
+MAX_LINE_LENGTH = 998
+
+# Header policy of the drafts: RFC 5322 headers on '\n' lines, like the rest of each message
+DRAFT_POLICY = policy.default.clone(linesep='\n')
+
+# C0 control characters and DEL: never allowed in a header value (CR/LF would start a new header)
+_CONTROL = re.compile(r'[\x00-\x1f\x7f]')
+
+# Lines an mbox reader would take for the start of a new message
+_FROM_LINE = re.compile(rb'^From ', re.MULTILINE)
+
+
+def compile_template(template):
+    """Turn a '{field}' template into a %-template and the fields it uses, raising ValueError if invalid"""
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid template {template!r}: {e}") from None
+
+    parts, fields = [], []
+    for literal, field, spec, conversion in parsed:
+        parts.append(literal.replace('%', '%%'))
+        if field is None:
+            continue
+        if field not in TEMPLATE_FIELDS:
+            raise ValueError(
+                f"Invalid template {template!r}: unknown placeholder {{{field}}} "
+                f"(use {', '.join('{' + f + '}' for f in TEMPLATE_FIELDS)})"
+            )
+        if spec or conversion:
+            raise ValueError(f"Invalid template {template!r}: placeholders take no format options")
+        parts.append(f"%({field})s")
+        if field not in fields:
+            fields.append(field)
+    return ''.join(parts), tuple(fields)
+
+
+class MailTemplate:
+    """Subject and body templates of one language, compiled once into %-templates"""
+
+    def __init__(self, subject, body):
+        self.subject = subject
+        self.body = body
+        self._subject, subject_fields = compile_template(subject)
+        self._body, body_fields = compile_template(body)
+        self.fields = tuple(dict.fromkeys(subject_fields + body_fields))
+
+    def render(self, values):
+        """(subject, body) filled from a {field: text} dict holding at least self.fields"""
+        subject = self._subject % values
+        return ' '.join(subject.split()), self._body % values
+
+    def __repr__(self):
+        return f"MailTemplate({self.subject!r}, {self.body!r})"
+
+
+def compile_templates(templates):
+    """{language: MailTemplate} from {language: {'subject': ..., 'body': ...}}"""
+    return {
+        language.strip().lower(): MailTemplate(template['subject'], template['body'])
+        for language, template in templates.items()
+    }
+
+
+def load_templates(path):
+    """Compile the templates of a JSON file laid out like DEFAULT_TEMPLATES"""
+    with open(path, encoding='utf-8') as f:
+        return compile_templates(json.load(f))
+
+
+def template_values(contact):
+    """Template values of a contact as text; missing and blank fields are left out"""
+    values = {}
+    for field in TEMPLATE_FIELDS:
+        value = contact.get(field)
+        if not is_empty(value):
+            values[field] = value.strip() if isinstance(value, str) else str(value)
+    if 'name' in values and 'first_name' not in values:
+        first, _, last = values['name'].partition(' ')
+        values['first_name'] = first
+        if last.strip() and 'last_name' not in values:
+            values['last_name'] = last.strip()
+    return {field: value for field, value in values.items() if value}
+
+
+def is_valid_address(email):
+    """True for a bare address (local@domain) that parses back unchanged, with no control characters"""
+    if _CONTROL.search(email):
+        return False
+    name, address = parseaddr(email)
+    local, _, domain = address.rpartition('@')
+    return not name and address == email and bool(local) and bool(domain)
+
+
+def header_text(value):
+    """Header text on one line: control characters dropped, runs of whitespace collapsed"""
+    return ' '.join(_CONTROL.sub(' ', value).split())
+
+
+@functools.lru_cache(maxsize=4096)
+def encode_header(value):
+    """Header text as is when ASCII, otherwise as RFC 2047 base64 encoded words on folded lines
+
+    Cached, as subjects mostly differ only by company.
+    """
+    if value.isascii():
+        return value
+    data = value.encode('utf-8')
+    if len(data) <= ENCODED_WORD_BYTES:
+        return base64mime.header_encode(data, 'utf-8')
+    words, chunk, size = [], [], 0
+    for char in value:
+        length = len(char.encode('utf-8'))
+        if size + length > ENCODED_WORD_BYTES:
+            words.append(base64mime.header_encode(''.join(chunk), 'utf-8'))
+            chunk, size = [], 0
+        chunk.append(char)
+        size += length
+    words.append(base64mime.header_encode(''.join(chunk), 'utf-8'))
+    return '\n '.join(words)
+
+
+class DraftBuilder:
+    """Renders contacts into RFC 5322 messages (bytes) with a fixed sender and date
+
+    Messages are plain UTF-8 text. The headers shared by every draft
+    (From, Date, MIME headers) are built once through the email package's
+    header registry, which parses the sender and encodes only its display
+    name; To and Subject are encoded per message with formataddr and RFC
+    2047 base64 words. Each message then costs a template fill and a few
+    string joins rather than building and flattening an email.message
+    object.
+    """
+
+    def __init__(self, sender='', date=None):
+        self.sender = sender
+        self.date = date or formatdate(localtime=True)
+        common = EmailMessage(policy=DRAFT_POLICY)
+        if sender:
+            common['From'] = sender
+            if not all(address.domain for address in common['From'].addresses):
+                raise ValueError(f"Invalid sender {sender!r}: expected an address such as 'Name <name@company.com>'")
+        common['Date'] = self.date
+        common['X-Unsent'] = '1'
+        common['MIME-Version'] = '1.0'
+        common['Content-Type'] = 'text/plain; charset="utf-8"'
+        self._common = ''.join(DRAFT_POLICY.fold(name, value) for name, value in common.items())
+
+    def build(self, values, subject, body):
+        """Message bytes for a rendered subject and body, sent to values['email']"""
+        to = formataddr((header_text(values.get('name', '')), values['email']))
+        body = body.replace('\r\n', '\n').replace('\r', '\n')
+        if max(map(len, body.split('\n'))) > MAX_LINE_LENGTH:
+            encoding, payload = 'base64', base64mime.body_encode(body.encode('utf-8'), eol='\n')
+        else:
+            encoding, payload = '8bit', body if body.endswith('\n') else body + '\n'
+        return (
+            f"To: {to}\nSubject: {encode_header(header_text(subject))}\n{self._common}"
+            f"Content-Transfer-Encoding: {encoding}\n\n{payload}"
+        ).encode('utf-8')
+
+
+def render_drafts(contacts, templates, builder, fallback_language=None):
+    """Yield (row, contact, message bytes, rejection reason) for each contact
+
+    Exactly one of message and reason is set: contacts without a valid
+    email (one that would not parse back as the same bare address, e.g.
+    with a line break smuggling in another header), without a template for their language or missing a field their
+    template uses are rejected instead of rendered.
+    """
+    for row, contact in enumerate(contacts, 1):
+        values = template_values(contact)
+        email = values.get('email', '')
+        if not is_valid_address(email):
+            yield row, contact, None, "missing or invalid email"
+            continue
+        language = values.get('language', '').lower()
+        template = templates.get(language) or templates.get(fallback_language)
+        if template is None:
+            yield row, contact, None, f"no template for language '{language}'"
+            continue
+        missing = [field for field in template.fields if field not in values]
+        if missing:
+            yield row, contact, None, f"missing {', '.join(missing)}"
+            continue
+        subject, body = template.render(values)
+        yield row, contact, builder.build(values, subject, body), None
+
+
+class MboxWriter:
+    """Appends messages to an mbox file, escaping body lines that start with 'From '"""
+
+    def __init__(self, path):
+        self.path = path
+        self._separator = f"From MAILER-DAEMON {time.asctime(time.gmtime())}\n".encode('ascii')
+        self._file = open(path, 'wb')
+
+    def write(self, row, message):
+        self._file.write(self._separator)
+        self._file.write(_FROM_LINE.sub(b'>From ', message))
+        self._file.write(b'\n')
+
+    def close(self):
+        self._file.close()
+
+
+class EmlDirectoryWriter:
+    """Writes each message to its own draft_<row>.eml file in a directory"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, row, message):
+        with open(os.path.join(self.path, f"draft_{row:06d}.eml"), 'wb') as f:
+            f.write(message)
+
+    def close(self):
+        pass
+
+
+def open_writer(output):
+    """MboxWriter for a .mbox path, EmlDirectoryWriter for anything else (a directory)"""
+    if str(output).lower().endswith('.mbox'):
+        return MboxWriter(output)
+    return EmlDirectoryWriter(output)
+
+
+@instrumented('mail_merge')
+def mail_merge(contacts, output, templates=None, sender='', report_path=None, fallback_language=None):
+    """Render personalized drafts for contacts into an mbox file or a directory of .eml files
+
+    Contacts are any iterable of dict-like rows (a ContactStore, records
+    streamed from a file) and are rendered one at a time, so memory stays
+    flat however many there are. templates is {language: MailTemplate}
+    (DEFAULT_TEMPLATES when None); fallback_language is used for contacts
+    whose language has no template. Rejected contacts are written to the
+    CSV report_path if given. Returns (drafts written, rejected).
+    """
+    templates = templates if templates is not None else compile_templates(DEFAULT_TEMPLATES)
+    builder = DraftBuilder(sender)
+    writer = open_writer(output)
+    report = open(report_path, 'w', newline='', encoding='utf-8') if report_path else None
+    written = rejected = 0
+    try:
+        if report is not None:
+            report_writer = csv.writer(report, lineterminator='\n')
+            report_writer.writerow(REPORT_COLUMNS)
+        for row, contact, message, reason in render_drafts(contacts, templates, builder, fallback_language):
+            if message is not None:
+                writer.write(row, message)
+                written += 1
+                continue
+            rejected += 1
+            if report is not None:
+                report_writer.writerow(
+                    [row] + [cell_value(contact.get(column)) for column in REPORT_COLUMNS[1:-1]] + [reason]
+                )
+    finally:
+        writer.close()
+        if report is not None:
+            report.close()
+    return written, rejected
+
+
+def iter_file_contacts(path):
+    """Stream the rows of a .csv or .xlsx contacts file as dicts, one chunk in memory at a time"""
+    for chunk in iter_chunks(path):
+        yield from chunk.to_dict('records')
+
+
+def merge_main(argv=None):
+    """Entry point of `python main.py merge contacts.xlsx drafts.mbox [options]`"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='main.py merge', description='Render personalized drafts for a contacts file')
+    parser.add_argument('input', help='contacts .csv or .xlsx file (e.g. an export)')
+    parser.add_argument('output', help='output .mbox file, or a directory for .eml files')
+    parser.add_argument('--templates', help='JSON file of {language: {"subject": ..., "body": ...}}')
+    parser.add_argument('--sender', default='', help='From address of the drafts')
+    parser.add_argument('--fallback-language', help='template for languages without their own')
+    parser.add_argument('--report', help='write rejected contacts to this CSV file')
+    args = parser.parse_args(argv)
+
+    templates = load_templates(args.templates) if args.templates else None
+    try:
+        DraftBuilder(args.sender)
+    except ValueError as e:
+        parser.error(str(e))
+    written, rejected = mail_merge(
+        iter_file_contacts(args.input), args.output, templates, sender=args.sender,
+        report_path=args.report, fallback_language=args.fallback_language,
+    )
+    print(f"✅ {written} drafts written to {args.output} ({rejected} rejected)")
+    if args.report:
+        print(f"📝 Rejection report saved to {args.report}")
+    return 1 if rejected else 0
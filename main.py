@@ -1,112 +1,227 @@
+import numpy as np
 import pandas as pd
-import re
+from collections import Counter
 from datetime import datetime
 import os
 
+from candidates import DEFAULT_MAX_CANDIDATES, iter_candidates, top_candidates
+from contact_export import EXCEL_COLUMNS, write_xlsx
+from contact_import import DEFAULT_CHUNK_SIZE, import_contacts
+from contact_journal import ContactJournal, export_changes, export_compacted
+from contact_record import now_epoch
+from company_registry import CompanyRegistry, RegistryError
+from company_resolver import CompanyResolver
+from contact_store import ContactStore
+from contact_validation import ContactValidator
+from email_formats import EmailFormat, parse_format
+from email_verification import verify_emails
+from format_inference import infer_formats
+from mail_merge import load_templates, mail_merge
+from metrics import count_error, enable, instrumented
+from name_normalizer import normalize_name
+from snapshot import iter_snapshot_contacts, write_snapshot
+
 class ProfessionalEmailGenerator:
-    def __init__(self):
-        # Dictionary mapping company names to their email formats
+    def __init__(self, store=None, registry=None):
+        # Company email formats and categories, loaded from companies.json
         # Format patterns: {f} = first name, {l} = last name, {fi} = first initial, {li} = last initial
-        self.company_formats = {
-            # Investment Banks
-            "Goldman Sachs": "{f}.{l}@gs.com",
-            "JPMorgan": "{f}.{l}@jpmorgan.com",
-            "Morgan Stanley": "{f}.{l}@morganstanley.com",
-            "Credit Suisse": "{f}.{l}@credit-suisse.com",
-            "UBS": "{f}.{l}@ubs.com",
-            "Citigroup": "{f}.{l}@citi.com",
-            "Deutsche Bank": "{f}.{l}@db.com",
-            "Barclays": "{f}.{l}@barclays.com",
-            "HSBC": "{f}.{l}@hsbc.com",
-            "Jefferies": "{fi}{l}@jefferies.com",
-            "Lazard": "{f}.{l}@lazard.com",
-            "RBC Capital Markets": "{f}.{l}@rbccm.com",
-            "Rothschild & Co": "{f}.{l}@rothschildandco.com",
-            "Standard Chartered": "{f}.{l}@sc.com",
-            
-            # French Banks
-            "BNP Paribas": "{f}.{l}@bnpparibas.com",
-            "BNP Paribas UK": "{f}.{l}@uk.bnpparibas.com",
-            "Crédit Agricole CIB": "{f}.{l}@ca-cib.com",
-            "Société Générale CIB": "{f}.{l}@sgcib.com",
-            "Natixis": "{f}.{l}@natixis.com",
-            "BPCE": "{f}.{l}@bpce.com",
-            "Crédit Mutuel": "{f}.{l}@creditmutuel.fr",
-            
-            # Hedge Funds & Asset Management
-            "Blackstone": "{f}.{l}@blackstone.com",
-            "KKR": "{f}.{l}@kkr.com",
-            "Apollo": "{f}.{l}@apollo.com",
-            "Carlyle": "{f}.{l}@carlyle.com",
-            "Bridgewater": "{f}.{l}@bridgewater.com",
-            "Two Sigma": "{f}.{l}@twosigma.com",
-            "Citadel": "{f}.{l}@citadel.com",
-            "Marshall Wace": "{f}.{l}@marshallwace.com",
-            "Man Group": "{f}.{l}@man.com",
-            "Odey Asset Management": "{f}.{l}@odey.com",
-            
-            # French Asset Management
-            "Amundi": "{f}.{l}@amundi.com",
-            "AXA Investment Managers": "{f}.{l}@axa-im.com",
-            "Lyxor": "{f}.{l}@lyxor.com",
-            "Carmignac": "{f}.{l}@carmignac.com",
-            "Tikehau Capital": "{f}.{l}@tikehaucapital.com",
-            
-            # Consulting
-            "McKinsey": "{f}_{l}@mckinsey.com",
-            "BCG": "{f}.{l}@bcg.com",
-            "Bain": "{f}.{l}@bain.com",
-            "Oliver Wyman": "{f}.{l}@oliverwyman.com",
-            "Roland Berger": "{f}.{l}@rolandberger.com",
-            
-            # Big 4
-            "Deloitte": "{f}{l}@deloitte.fr",
-            "PwC": "{f}.{l}@pwc.com",
-            "KPMG": "{f}{l}@kpmg.fr",
-            "EY": "{f}.{l}@ey.com",
-            
-            # Private Equity
-            "Advent International": "{f}.{l}@adventinternational.com",
-            "Apax Partners": "{f}.{l}@apax.com",
-            "CVC Capital": "{f}.{l}@cvc.com",
-            "Permira": "{f}.{l}@permira.com",
-            "PAI Partners": "{f}.{l}@paipartners.com",
-            "Eurazeo": "{f}.{l}@eurazeo.com",
-        }
+        # The registry is an immutable snapshot swapped on writes: each call below
+        # reads it once, so it works on one consistent version without locking
+        self.registry = registry if registry is not None else CompanyRegistry()
+        
+        # Compiled form of each pattern, built on first use and rebuilt only when a company's format changes
+        self._compiled_formats = {}
         
-        # Data storage
-        self.contacts = []
+        # (registry version, fuzzy company matcher), built on first use for the current version
+        self._resolver = None
         
+        # Data storage: in-memory by default, or any store with the ContactStore
+        # interface (e.g. SQLiteContactStore for a persistent database)
+        self.contacts = store if store is not None else ContactStore()
+        
+    @property
+    def company_formats(self):
+        """Email format pattern of every registered company"""
+        return self.registry.formats
+    
+    @property
+    def categories(self):
+        """Registered companies by category"""
+        return self.registry.categories
+    
+    def reload_registry(self):
+        """Pick up edits to the registry file without restarting; True if it changed"""
+        return self.registry.reload_if_changed()
+    
     def clean_name(self, name):
         """Clean and format names"""
-        # Remove extra spaces and convert to lowercase
-        name = re.sub(r'\s+', ' ', name.strip().lower())
-        # Remove special characters but keep hyphens and apostrophes
-        name = re.sub(r"[^\w\s\-']", '', name)
-        return name
+        return normalize_name(name)
+    
+    def get_format(self, company, formats=None):
+        """Return the compiled email format of a company (in formats, or the current registry)"""
+        pattern = (formats if formats is not None else self.company_formats).get(company)
+        if pattern is None:
+            raise ValueError(f"Company '{company}' not found in database")
+        
+        compiled = self._compiled_formats.get(company)
+        if compiled is None or compiled.pattern != pattern:
+            # Format was edited in place: recompile it once
+            compiled = self._compiled_formats[company] = EmailFormat(pattern)
+        return compiled
+    
+    def add_company(self, company, format_pattern, category=None):
+        """Register (or update) a company email format, validating it first
+        
+        The company is saved to the registry file, under category (or its
+        current category, or "Other").
+        """
+        compiled = EmailFormat(format_pattern)
+        self.registry.add(company, format_pattern, category)
+        self._compiled_formats[company] = compiled
+        return compiled
     
+    def resolve_company(self, company, snapshot=None):
+        """Match a free-text company name to a registered company
+        
+        Returns (company, confidence), or (None, score) when nothing is close enough.
+        """
+        snapshot = snapshot if snapshot is not None else self.registry.snapshot
+        resolver = self._resolver
+        if resolver is None or resolver[0] != snapshot.version:
+            # One assignment, so other threads see either the old pair or the new one
+            resolver = self._resolver = (snapshot.version, CompanyResolver(snapshot.formats))
+        return resolver[1].resolve(company)
+    
+    def suggest_formats(self, min_support=3):
+        """Propose email formats per domain, mined from the addresses in the database
+        
+        Adds a 'registered' column with the current format of the matching
+        company, so disagreements with the registry stand out.
+        """
+        proposals = infer_formats(self.contacts, min_support=min_support)
+        proposals['registered'] = proposals['company'].map(self.company_formats)
+        return proposals
+    
+    @instrumented('generate_email')
     def generate_email(self, first_name, last_name, company):
         """Generate email based on company format"""
-        if company not in self.company_formats:
-            raise ValueError(f"Company '{company}' not found in database")
+        email_format = self.get_format(company)
         
         # Clean names
         first_clean = self.clean_name(first_name)
         last_clean = self.clean_name(last_name)
         
-        # Get format pattern
-        format_pattern = self.company_formats[company]
+        return email_format.render(first_clean, last_clean)
+    
+    def generate_candidates(self, first_name, last_name, company, max_candidates=DEFAULT_MAX_CANDIDATES):
+        """Ranked candidate addresses for one person, the registry format first
+        
+        Companies that are not registry keys go through resolve_company.
+        Raises ValueError when the company is unknown or a name is missing.
+        """
+        snapshot = self.registry.snapshot
+        if company not in snapshot.formats:
+            resolved, _ = self.resolve_company(company, snapshot)
+            if resolved is None:
+                raise ValueError(f"Company '{company}' not found in database")
+            company = resolved
+        if not isinstance(first_name, str) or not isinstance(last_name, str):
+            raise ValueError("First and last name are required")
+        first_clean, last_clean = self.clean_name(first_name), self.clean_name(last_name)
+        if not first_clean or not last_clean:
+            raise ValueError("First and last name are required")
+    
+        pattern = self.get_format(company, snapshot.formats).pattern
+        return top_candidates(pattern, first_clean, last_clean, max_candidates)
+    
+    def iter_candidates(self, people, max_candidates=DEFAULT_MAX_CANDIDATES, on_error=None):
+        """Lazily yield (first_name, last_name, company, rank, email) over (first, last, company) rows"""
+        return iter_candidates(self, people, max_candidates, on_error)
+    
+    @instrumented('clean_names')
+    def _clean_unique(self, names):
+        """Factorize a column of names and clean each distinct value once
+        
+        Returns (codes, cleaned) where cleaned[codes] gives the cleaned name of
+        every row, and None for missing or non-string names.
+        """
+        codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+        cleaned = [normalize_name(name) if isinstance(name, str) else None for name in uniques]
+        # Missing names are coded -1, which picks the trailing None
+        return codes, np.array(cleaned + [None], dtype=object)
+    
+    def clean_names(self, names):
+        """Clean a whole Series of names at once (same rules as clean_name)"""
+        codes, cleaned = self._clean_unique(names)
+        return pd.Series(cleaned[codes], index=names.index, dtype=object)
+    
+    @instrumented('generate_emails')
+    def generate_emails(self, df, first_col='first_name', last_col='last_name', company_col='company',
+                        resolve_companies=False):
+        """Generate emails for every row of a DataFrame
+        
+        Returns (emails, errors): emails is a Series aligned on df.index holding
+        the same address generate_email would return, or None where generation
+        failed; errors is a boolean mask of rows whose company is unknown or
+        whose names are missing. With resolve_companies=True, company values
+        that are not exact registry keys go through resolve_company first.
+        """
+        snapshot = self.registry.snapshot
+        formats = snapshot.formats
+        first_codes, first_clean = self._clean_unique(df[first_col])
+        last_codes, last_clean = self._clean_unique(df[last_col])
+        company_codes, companies = pd.factorize(np.asarray(df[company_col], dtype=object))
+        
+        # Resolve each distinct company to a format id (-1 when unknown)
+        patterns = []
+        pattern_ids = np.full(len(companies) + 1, -1)
+        for i, company in enumerate(companies):
+            if resolve_companies and company not in formats:
+                company, _ = self.resolve_company(company, snapshot)
+            if company in formats:
+                email_format = self.get_format(company, formats)
+                if email_format.pattern not in patterns:
+                    patterns.append(email_format.pattern)
+                pattern_ids[i] = patterns.index(email_format.pattern)
+        row_patterns = pattern_ids[company_codes]
+        
+        first_rows = first_clean[first_codes]
+        last_rows = last_clean[last_codes]
+        errors = (row_patterns == -1) | pd.isna(first_rows) | pd.isna(last_rows)
+        emails = np.full(len(df), None, dtype=object)
         
-        # Replace placeholders
-        email = format_pattern.format(
-            f=first_clean,
-            l=last_clean,
-            fi=first_clean[0] if first_clean else '',
-            li=last_clean[0] if last_clean else ''
-        )
+        # Placeholder values per distinct name, picked per row through the codes
+        fields = {
+            'f': (first_codes, first_clean),
+            'l': (last_codes, last_clean),
+            'fi': (first_codes, self._initials(first_clean)),
+            'li': (last_codes, self._initials(last_clean)),
+        }
+        
+        # Render each distinct format once over all of its rows
+        for pattern_id, pattern in enumerate(patterns):
+            rows = np.flatnonzero((row_patterns == pattern_id) & ~errors)
+            if len(rows):
+                emails[rows] = self._render_pattern(pattern, fields, rows)
         
+        return pd.Series(emails, index=df.index, dtype=object), pd.Series(errors, index=df.index)
+    
+    def _initials(self, cleaned):
+        """First letter of each cleaned name ('' for empty names)"""
+        return np.array([name[:1] if name is not None else None for name in cleaned], dtype=object)
+    
+    def _render_pattern(self, pattern, fields, rows):
+        """Apply a format pattern to the selected rows, one column at a time"""
+        email = np.full(len(rows), '', dtype=object)
+        for literal, field in parse_format(pattern):
+            if literal:
+                email = email + literal
+            if field is not None:
+                codes, values = fields[field]
+                email = email + values[codes[rows]]
         return email
     
+    @instrumented('add_contact')
     def add_contact(self, first_name, last_name, company, position="", source="", language="fr", custom_message=""):
         """Add a contact to the database"""
         try:
@@ -120,52 +235,53 @@ class ProfessionalEmailGenerator:
                 'source': source,
                 'language': language,
                 'custom_message': custom_message,
-                'date_added': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'date_added': now_epoch()
             }
             
-            self.contacts.append(contact)
+            contact = self.contacts.add(contact)
             print(f"✅ Contact added: {contact['name']} - {contact['email']}")
             return contact
             
         except ValueError as e:
+            count_error('add_contact', e)
             print(f"❌ Error: {e}")
             return None
     
+    def delete_contact(self, contact_id):
+        """Delete a contact by its ID"""
+        if contact_id not in self.contacts:
+            print(f"❌ No contact with ID {contact_id}")
+            return None
+        
+        contact = self.contacts.remove(contact_id)
+        print(f"✅ Contact deleted: {contact['name']} - {contact['email']}")
+        return contact
+    
     def list_companies(self):
         """Display all available companies"""
         print("\n📋 Available Companies:")
         print("=" * 50)
         
-        categories = {
-            "Investment Banks": ["Goldman Sachs", "JPMorgan", "Morgan Stanley", "Credit Suisse", "UBS", "Citigroup", "Deutsche Bank", "Barclays", "HSBC", "Jefferies", "Lazard", "RBC Capital Markets", "Rothschild & Co", "Standard Chartered"],
-            "French Banks": ["BNP Paribas", "BNP Paribas UK", "Crédit Agricole CIB", "Société Générale CIB", "Natixis", "BPCE", "Crédit Mutuel"],
-            "Hedge Funds & Asset Management": ["Blackstone", "KKR", "Apollo", "Carlyle", "Bridgewater", "Two Sigma", "Citadel", "Marshall Wace", "Man Group", "Odey Asset Management"],
-            "French Asset Management": ["Amundi", "AXA Investment Managers", "Lyxor", "Carmignac", "Tikehau Capital"],
-            "Consulting": ["McKinsey", "BCG", "Bain", "Oliver Wyman", "Roland Berger"],
-            "Big 4": ["Deloitte", "PwC", "KPMG", "EY"],
-            "Private Equity": ["Advent International", "Apax Partners", "CVC Capital", "Permira", "PAI Partners", "Eurazeo"]
-        }
-        
-        for category, companies in categories.items():
+        for category, companies in self.categories.items():
             print(f"\n🏢 {category}:")
             for i, company in enumerate(companies, 1):
                 print(f"   {i:2d}. {company}")
     
+    @instrumented('search_contacts')
     def search_contacts(self, query=""):
         """Search contacts by name, company, or email"""
-        if not query:
-            return self.contacts
-        
-        query = query.lower()
-        results = []
-        
-        for contact in self.contacts:
-            if (query in contact['name'].lower() or 
-                query in contact['company'].lower() or 
-                query in contact['email'].lower()):
-                results.append(contact)
+        return self.contacts.search(query)
+    
+    def verify_contacts(self, verifier=None):
+        """Ask each domain's mail server whether the stored addresses exist
         
-        return results
+        Returns {email: verdict} ('valid', 'invalid', 'catch-all' or
+        'unknown'); see email_verification.EmailVerifier for the options.
+        """
+        verdicts = verify_emails((contact['email'] for contact in self.contacts), verifier)
+        counts = Counter(verdicts.values())
+        print("📬 Verification: " + ", ".join(f"{verdict}: {count}" for verdict, count in sorted(counts.items())))
+        return verdicts
     
     def display_contacts(self, contacts=None):
         """Display contacts in a formatted table"""
@@ -189,6 +305,7 @@ class ProfessionalEmailGenerator:
             message = contact.get('custom_message', '')[:19]
             print(f"{name:<20} {email:<35} {company:<25} {position:<15} {message:<20}")
     
+    @instrumented('export_to_excel')
     def export_to_excel(self, filename=None):
         """Export contacts to Excel file"""
         if not self.contacts:
@@ -199,38 +316,138 @@ class ProfessionalEmailGenerator:
             filename = f"contacts_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         
         try:
-            df = pd.DataFrame(self.contacts)
-            # Reorder columns as requested
-            column_order = ['name', 'email', 'company', 'position', 'source', 'language', 'custom_message', 'date_added']
-            df = df[column_order]
-            
-            df.to_excel(filename, index=False, sheet_name='Contacts')
+            # Rows are streamed straight from the store into a write-only workbook
+            write_xlsx(self.contacts, filename, EXCEL_COLUMNS)
             print(f"✅ Contacts exported to: {filename}")
             return filename
             
         except Exception as e:
+            count_error('export_to_excel', e)
             print(f"❌ Export failed: {e}")
             return None
     
-    def load_from_excel(self, filename):
-        """Load contacts from Excel file"""
+    @instrumented('load_from_excel')
+    def load_from_excel(self, filename, chunk_size=DEFAULT_CHUNK_SIZE, rejects_file=None):
+        """Load contacts from an Excel (or CSV) file, streaming it in chunks
+        
+        Rows are validated first (see ContactValidator): rows with a bad
+        email, an unknown company, etc. are skipped, counted by reason and,
+        if rejects_file is given, written to that CSV with their reasons.
+        """
+        reasons = Counter()
+        
+        def report(rows_read, added, duplicates):
+            print(f"   ⏳ {rows_read:,} rows read ({added:,} added, {duplicates:,} duplicates merged, "
+                  f"{sum(reasons.values()):,} rejected)")
+        
+        def reject(rejected):
+            reasons.update(rejected['reason'].value_counts().to_dict())
+            if rejects_file:
+                first = sum(reasons.values()) == len(rejected)
+                rejected.to_csv(rejects_file, mode='w' if first else 'a', header=first, index=False)
+        
         try:
-            df = pd.read_excel(filename)
-            loaded_contacts = df.to_dict('records')
-            self.contacts.extend(loaded_contacts)
-            print(f"✅ Loaded {len(loaded_contacts)} contacts from {filename}")
+            added, duplicates = import_contacts(
+                self.contacts, filename, chunk_size=chunk_size, on_duplicate='merge', progress=report,
+                validator=ContactValidator(self.company_formats), on_reject=reject
+            )
+            print(f"✅ Loaded {added} contacts from {filename} ({duplicates} duplicates merged, "
+                  f"{sum(reasons.values())} rejected)")
+            for reason, count in reasons.most_common():
+                print(f"   ⚠️ {count} × {reason}")
+            if reasons and rejects_file:
+                print(f"📝 Rejected rows saved to {rejects_file}")
             
         except Exception as e:
+            count_error('load_from_excel', e)
             print(f"❌ Failed to load from Excel: {e}")
 
+    def export_changes(self, filename, since=0):
+        """Export only the contacts changed since a checkpoint to CSV or NDJSON
+        
+        Needs a store with a change journal. since=None exports every live
+        contact, rebuilt by compacting the journal. Returns the checkpoint
+        to pass as since next time (None on failure).
+        """
+        journal = getattr(self.contacts, 'journal', None)
+        if journal is None:
+            print("❌ No change journal: set CONTACTS_JOURNAL to record changes.")
+            return None
+        
+        try:
+            if since is None:
+                count, checkpoint = export_compacted(journal, filename)
+            else:
+                count, checkpoint = export_changes(journal, filename, since)
+            print(f"✅ {count} changes exported to: {filename} (next checkpoint: {checkpoint})")
+            return checkpoint
+            
+        except Exception as e:
+            print(f"❌ Export failed: {e}")
+            return None
+
+    def mail_merge(self, output, templates_path=None, sender='', report=None):
+        """Render a personalized draft per contact into an .mbox file or a directory of .eml files
+        
+        templates_path is a JSON file of per-language subject and body
+        templates (built-in French and English ones if None). Contacts that
+        cannot be rendered are listed in the CSV report. Returns (written, rejected).
+        """
+        try:
+            templates = load_templates(templates_path) if templates_path else None
+            written, rejected = mail_merge(self.contacts, output, templates, sender=sender, report_path=report)
+            print(f"✅ {written} drafts written to {output} ({rejected} rejected)")
+            return written, rejected
+            
+        except Exception as e:
+            count_error('mail_merge', e)
+            print(f"❌ Mail merge failed: {e}")
+            return None
+
+    def save_snapshot(self, filename):
+        """Save contacts to a Parquet (.parquet) or Arrow (.arrow) snapshot"""
+        try:
+            write_snapshot(self.contacts, filename)
+            print(f"✅ Snapshot saved to: {filename}")
+            return filename
+            
+        except Exception as e:
+            print(f"❌ Snapshot failed: {e}")
+            return None
+    
+    def load_snapshot(self, filename):
+        """Load contacts from a Parquet or Arrow snapshot"""
+        try:
+            added, duplicates = self.contacts.add_many(iter_snapshot_contacts(filename), on_duplicate='merge')
+            print(f"✅ Loaded {added} contacts from {filename} ({duplicates} duplicates merged)")
+            
+        except Exception as e:
+            print(f"❌ Failed to load snapshot: {e}")
+
 def main():
-    """Main interactive function"""
-    generator = ProfessionalEmailGenerator()
+    """Main interactive function
+    
+    Set MAILGEN_METRICS to a file path (.json, or .prom for Prometheus text)
+    to collect call counts, errors and latencies, written on exit.
+    Set CONTACTS_JOURNAL to a file path to keep contacts between runs in an
+    append-only change journal, which option 9 exports incrementally.
+    """
+    journal_path = os.environ.get('CONTACTS_JOURNAL')
+    store = ContactStore(journal=ContactJournal(journal_path)) if journal_path else None
+    generator = ProfessionalEmailGenerator(store)
+    metrics_path = os.environ.get('MAILGEN_METRICS')
+    metrics = enable() if metrics_path else None
     
     print("🚀 Professional Email Generator")
     print("===============================")
     
     while True:
+        try:
+            if generator.reload_registry():
+                print("🔄 Company registry reloaded")
+        except RegistryError as e:
+            print(f"⚠️ Company registry not reloaded, keeping the previous version: {e}")
+        
         print("\n📋 Options:")
         print("1. Add contact")
         print("2. View all contacts")
@@ -238,9 +455,12 @@ def main():
         print("4. List available companies")
         print("5. Export to Excel")
         print("6. Load from Excel")
-        print("7. Exit")
+        print("7. Save snapshot (Parquet/Arrow)")
+        print("8. Load snapshot")
+        print("9. Export changes since a checkpoint")
+        print("10. Exit")
         
-        choice = input("\nSelect option (1-7): ").strip()
+        choice = input("\nSelect option (1-10): ").strip()
         
         if choice == '1':
             print("\n➕ Add New Contact")
@@ -276,11 +496,32 @@ def main():
         elif choice == '6':
             filename = input("\n📂 Excel filename to load: ").strip()
             if os.path.exists(filename):
-                generator.load_from_excel(filename)
+                rejects_file = input("Rejected rows CSV (optional): ").strip()
+                generator.load_from_excel(filename, rejects_file=rejects_file or None)
             else:
                 print("❌ File not found.")
                 
         elif choice == '7':
+            filename = input("\n💾 Snapshot filename (.parquet or .arrow): ").strip()
+            generator.save_snapshot(filename or "contacts.parquet")
+            
+        elif choice == '8':
+            filename = input("\n📂 Snapshot filename to load: ").strip()
+            if os.path.exists(filename):
+                generator.load_snapshot(filename)
+            else:
+                print("❌ File not found.")
+                
+        elif choice == '9':
+            filename = input("\n💾 Delta filename (.csv or .ndjson): ").strip() or "contacts_delta.csv"
+            since = input("Checkpoint (blank for a full snapshot): ").strip()
+            generator.export_changes(filename, int(since) if since.isdigit() else None)
+            
+        elif choice == '10':
+            if metrics is not None:
+                with open(metrics_path, 'w', encoding='utf-8') as f:
+                    f.write(metrics.to_prometheus() if metrics_path.endswith('.prom') else metrics.to_json())
+                print(f"📈 Metrics saved to {metrics_path}")
             print("\n👋 Goodbye!")
             break
             
@@ -289,6 +530,18 @@ def main():
 
 # Example usage
 if __name__ == "__main__":
+    import sys
+    
+    # Headless mode: python main.py bulk in.csv out.csv --workers N --chunk-size K
+    if len(sys.argv) > 1 and sys.argv[1] == 'bulk':
+        from bulk import bulk_main
+        sys.exit(bulk_main(sys.argv[2:]))
+    
+    # Headless mail merge: python main.py merge contacts.xlsx drafts.mbox --templates t.json
+    if len(sys.argv) > 1 and sys.argv[1] == 'merge':
+        from mail_merge import merge_main
+        sys.exit(merge_main(sys.argv[2:]))
+    
     # You can run the interactive version
     # main()
     
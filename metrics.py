@@ -0,0 +1,168 @@
+import functools
+import json
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one catches everything
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, float('inf'))
+
+# Prefix of the exported Prometheus metric names
+PROMETHEUS_PREFIX = 'mailgen'
+
+# Metrics collecting in the current context (thread / Streamlit session); None when disabled
+_current = ContextVar('metrics', default=None)
+
+
+class Metrics:
+    """Call counts, error counts by exception type and latency histograms per operation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = defaultdict(int)
+            self.errors = defaultdict(lambda: defaultdict(int))
+            self.buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+            self.seconds = defaultdict(float)
+
+    def observe(self, name, seconds):
+        """Record one call of an operation and its duration"""
+        with self._lock:
+            self.calls[name] += 1
+            self.seconds[name] += seconds
+            self.buckets[name][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def count_error(self, name, error):
+        """Record an error raised (or caught and reported) by an operation"""
+        with self._lock:
+            self.errors[name][type(error).__name__] += 1
+
+    def quantile(self, name, q):
+        """Upper bound of the histogram bucket holding the q-quantile latency (None if no calls)"""
+        counts = self.buckets.get(name)
+        total = self.calls.get(name, 0)
+        if not counts or not total:
+            return None
+        rank, seen = q * total, 0
+        for bound, count in zip(LATENCY_BUCKETS, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'errors': {name: dict(types) for name, types in self.errors.items()},
+                'latency': {
+                    name: {
+                        'count': self.calls[name],
+                        'sum': self.seconds[name],
+                        'buckets': {
+                            format_bound(bound): count
+                            for bound, count in zip(LATENCY_BUCKETS, cumulative(counts))
+                        },
+                    }
+                    for name, counts in self.buckets.items()
+                },
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """Metrics in the Prometheus text exposition format"""
+        data = self.to_dict()
+        lines = [
+            f"# HELP {prefix}_calls_total Calls per operation",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines += [f'{prefix}_calls_total{{operation="{name}"}} {count}' for name, count in data['calls'].items()]
+        lines += [
+            f"# HELP {prefix}_errors_total Errors per operation and exception type",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        lines += [
+            f'{prefix}_errors_total{{operation="{name}",type="{error}"}} {count}'
+            for name, types in data['errors'].items() for error, count in types.items()
+        ]
+        lines += [
+            f"# HELP {prefix}_latency_seconds Duration of each operation",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for name, latency in data['latency'].items():
+            lines += [
+                f'{prefix}_latency_seconds_bucket{{operation="{name}",le="{bound}"}} {count}'
+                for bound, count in latency['buckets'].items()
+            ]
+            lines.append(f'{prefix}_latency_seconds_sum{{operation="{name}"}} {latency["sum"]}')
+            lines.append(f'{prefix}_latency_seconds_count{{operation="{name}"}} {latency["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def cumulative(counts):
+    total, result = 0, []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def enable(metrics=None):
+    """Start collecting into metrics (a new Metrics if None) in the current context; returns it"""
+    metrics = metrics if metrics is not None else Metrics()
+    _current.set(metrics)
+    return metrics
+
+
+def disable():
+    _current.set(None)
+
+
+def current():
+    """Metrics collecting in the current context, or None"""
+    return _current.get()
+
+
+def count_error(name, error):
+    """Record an error that an operation handles itself (no-op when disabled)"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.count_error(name, error)
+
+
+def instrumented(name):
+    """Decorator recording calls, errors and latency of a function under name
+
+    When metrics are disabled the wrapper costs a single context variable
+    lookup before calling through, so it is meant for calls that do real
+    work (per-row helpers like clean_name are left uninstrumented).
+    """
+    get_current = _current.get
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = get_current()
+            if metrics is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                metrics.count_error(name, e)
+                raise
+            finally:
+                metrics.observe(name, perf_counter() - start)
+        return wrapper
+    return decorate
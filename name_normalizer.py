@@ -0,0 +1,54 @@
+import unicodedata
+from functools import lru_cache
+
+# Distinct names kept in the normalization cache
+CACHE_SIZE = 65536
+
+# Characters that separate the parts of a compound name ("Le Gall", "Jean–Luc")
+SEPARATORS = "-_‐‑‒–—−"
+APOSTROPHES = "'’‘ʼ`´"
+
+# Letters that do not decompose into a base letter plus accents
+SPECIAL_LETTERS = {
+    'ß': 'ss', 'ẞ': 'ss', 'æ': 'ae', 'Æ': 'ae', 'œ': 'oe', 'Œ': 'oe',
+    'ø': 'o', 'Ø': 'o', 'đ': 'd', 'Đ': 'd', 'ð': 'd', 'Ð': 'd',
+    'ł': 'l', 'Ł': 'l', 'þ': 'th', 'Þ': 'th', 'ı': 'i', 'ħ': 'h', 'Ħ': 'h',
+}
+
+
+def fold_char(char):
+    """Map one character to its lowercase ASCII form, ' ' for separators or '' to drop it"""
+    if char.isspace() or char in SEPARATORS:
+        return ' '
+    if char in APOSTROPHES:
+        return "'"
+    if char in SPECIAL_LETTERS:
+        return SPECIAL_LETTERS[char]
+    folded = ''.join(
+        c for c in unicodedata.normalize('NFKD', char.lower()) if not unicodedata.combining(c)
+    )
+    return folded if folded.isalnum() else ''
+
+
+class _FoldTable(dict):
+    """str.translate table: Latin ranges precomputed, other characters folded on first use"""
+
+    def __missing__(self, code):
+        folded = self[code] = fold_char(chr(code))
+        return folded
+
+
+# Basic Latin through Latin Extended-B covers the names we see in practice
+FOLD_TABLE = _FoldTable((code, fold_char(chr(code))) for code in range(0x250))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_name(name):
+    """Normalize a name for use in an email address
+
+    Lowercases, folds accents ("Étienne" -> "etienne"), drops punctuation
+    other than apostrophes, and joins the parts of compound names with a
+    single hyphen ("Le  Gall" -> "le-gall", "Jean - Luc" -> "jean-luc").
+    Results are memoized; normalize_name.cache_info() reports hits/misses.
+    """
+    return '-'.join(name.translate(FOLD_TABLE).split())
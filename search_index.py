@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+# Contact fields covered by search, matched case-insensitively as substrings
+SEARCH_FIELDS = ('name', 'company', 'email')
+
+GRAM_SIZE = 3
+
+# Joins the field values of a contact into one string for verification
+SEPARATOR = '\x00'
+
+
+def searchable_texts(contact):
+    """Lowercased values of the searchable fields (missing values become '')"""
+    return tuple(
+        value.lower().replace(SEPARATOR, '') if isinstance(value, str) else ''
+        for value in (contact.get(field) for field in SEARCH_FIELDS)
+    )
+
+
+def trigrams(text):
+    """Set of all GRAM_SIZE-character substrings of text"""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """Inverted trigram index answering substring queries over contact fields
+
+    Each trigram maps to the set of contact IDs having it in one of the
+    SEARCH_FIELDS. A query is answered by intersecting the posting sets of
+    its trigrams (smallest first) and then checking the remaining candidates
+    with a plain substring test, so results are exactly those of
+    `query.lower() in field.lower()`. Queries shorter than a trigram fall
+    back to checking every contact. Field values are kept joined by a NUL
+    separator so each candidate is verified with a single `in` test.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._texts = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, contact_id, contact):
+        """Index (or re-index) a contact"""
+        if contact_id in self._texts:
+            self.remove(contact_id)
+        texts = searchable_texts(contact)
+        self._texts[contact_id] = SEPARATOR.join(texts)
+        for gram in set().union(*map(trigrams, texts)):
+            self._postings[gram].add(contact_id)
+
+    def remove(self, contact_id):
+        """Drop a contact from the index"""
+        text = self._texts.pop(contact_id, None)
+        if text is None:
+            return
+        texts = text.split(SEPARATOR)
+        for gram in set().union(*map(trigrams, texts)):
+            posting = self._postings[gram]
+            posting.discard(contact_id)
+            if not posting:
+                del self._postings[gram]
+
+    def clear(self):
+        self._postings.clear()
+        self._texts.clear()
+
+    def search(self, query):
+        """IDs (ascending) of contacts with query in their name, company or email"""
+        query = query.lower()
+        if SEPARATOR in query:
+            return []
+        if len(query) < GRAM_SIZE:
+            candidates = self._texts.keys()
+        else:
+            postings = sorted(
+                (self._postings.get(gram, ()) for gram in trigrams(query)), key=len
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+
+        texts = self._texts
+        matches = [contact_id for contact_id in candidates if query in texts[contact_id]]
+        matches.sort()
+        return matches
@@ -0,0 +1,184 @@
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from contact_record import ContactRecord, from_epoch
+from contact_validation import parse_dates
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Low-cardinality columns stored dictionary-encoded
+CATEGORICAL_FIELDS = ('company', 'language', 'source')
+
+SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('name', pa.string()),
+    ('email', pa.string()),
+    ('company', pa.dictionary(pa.int32(), pa.string())),
+    ('position', pa.string()),
+    ('source', pa.dictionary(pa.int32(), pa.string())),
+    ('language', pa.dictionary(pa.int32(), pa.string())),
+    ('custom_message', pa.string()),
+    ('date_added', pa.timestamp('s')),
+])
+
+# Contacts converted and written per record batch
+BATCH_SIZE = 50_000
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+
+def snapshot_format(path):
+    """'parquet' or 'arrow', from the file extension"""
+    for extension, fmt in FORMATS.items():
+        if str(path).lower().endswith(extension):
+            return fmt
+    raise ValueError(f"Unsupported snapshot file: {path} (expected {', '.join(FORMATS)})")
+
+
+def to_text(value):
+    """String column value (None for missing)"""
+    if value is None or value != value or value == '':
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def to_timestamp(value):
+    """Parse date_added, whichever type it arrived as, into a naive datetime
+
+    Strings that are not ISO dates are read the way imports read them
+    (offsets converted to UTC); one that cannot be read raises ValueError
+    rather than being dropped from the snapshot.
+    """
+    if isinstance(value, int):
+        return from_epoch(value)
+    if isinstance(value, datetime):
+        # NaT (pandas' missing timestamp) is a datetime that is not equal to itself
+        return value if value == value else None
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            dates, numeric = parse_dates(pd.Series([value], dtype=object))
+            if numeric.iloc[0] or pd.isna(dates.iloc[0]):
+                raise ValueError(f"Invalid date_added {value!r}: expected a date such as '2024-01-31 09:30:00'") from None
+            return dates.iloc[0].to_pydatetime()
+        return parsed if parsed.tzinfo is None else parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return None
+
+
+class DictionaryEncoder:
+    """Encodes one column across batches with a single, growing dictionary
+
+    Each batch's dictionary extends the previous one, so writers only emit
+    the new entries (dictionary deltas) instead of replacing it.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, values):
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+                continue
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            indices.append(code)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()), pa.array(self.values, type=pa.string())
+        )
+
+
+def iter_batches(contacts):
+    """Convert contacts into record batches of at most BATCH_SIZE rows"""
+    encoders = {field: DictionaryEncoder() for field in CATEGORICAL_FIELDS}
+
+    def make_batch(rows):
+        columns = []
+        for field in SCHEMA.names:
+            if field == 'date_added':
+                # Records keep date_added as an epoch: skip the string round trip
+                values = [row.date_epoch if isinstance(row, ContactRecord) else row.get(field) for row in rows]
+            else:
+                values = [row.get(field) for row in rows]
+            if field == 'id':
+                columns.append(pa.array(values, type=pa.int64()))
+            elif field == 'date_added':
+                columns.append(pa.array([to_timestamp(v) for v in values], type=pa.timestamp('s')))
+            elif field in encoders:
+                columns.append(encoders[field].encode([to_text(v) for v in values]))
+            else:
+                columns.append(pa.array([to_text(v) for v in values], type=pa.string()))
+        return pa.record_batch(columns, schema=SCHEMA)
+
+    rows = []
+    for contact in contacts:
+        rows.append(contact)
+        if len(rows) == BATCH_SIZE:
+            yield make_batch(rows)
+            rows = []
+    if rows:
+        yield make_batch(rows)
+
+
+def write_snapshot(contacts, path):
+    """Write contacts to a Parquet (.parquet) or Arrow IPC (.arrow) snapshot, batch by batch
+
+    The file is written under a temporary name and renamed when complete,
+    so a contact that cannot be converted leaves any previous snapshot
+    in place.
+    """
+    fmt = snapshot_format(path)
+    temporary = f"{path}.tmp{os.getpid()}"
+    try:
+        if fmt == 'parquet':
+            with pq.ParquetWriter(temporary, SCHEMA) as writer:
+                for batch in iter_batches(contacts):
+                    writer.write_batch(batch)
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            with pa.OSFile(temporary, 'wb') as sink, pa.ipc.new_file(sink, SCHEMA, options=options) as writer:
+                for batch in iter_batches(contacts):
+                    writer.write_batch(batch)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+
+
+def read_snapshot(path, columns=None):
+    """Open a snapshot as a pyarrow Table, memory-mapped, reading only columns if given"""
+    if snapshot_format(path) == 'parquet':
+        return pq.read_table(path, columns=columns, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def load_snapshot(path, columns=None):
+    """Open a snapshot as a DataFrame (categorical columns stay categorical)"""
+    return read_snapshot(path, columns).to_pandas()
+
+
+def iter_snapshot_contacts(path, columns=None):
+    """Yield snapshot rows as contact dicts, with date_added formatted like add_contact"""
+    table = read_snapshot(path, columns)
+    for batch in table.to_batches(max_chunksize=BATCH_SIZE):
+        for row in batch.to_pylist():
+            row.pop('id', None)
+            if row.get('date_added') is not None:
+                row['date_added'] = row['date_added'].strftime(DATE_FORMAT)
+            yield {field: '' if value is None else value for field, value in row.items()}
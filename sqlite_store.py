@@ -0,0 +1,276 @@
+import sqlite3
+from datetime import datetime
+
+from contact_record import format_epoch
+from contact_store import DUPLICATE_POLICIES, DuplicateContactError, email_key, is_empty, name_company_key
+from search_index import SEPARATOR, searchable_texts
+
+# Columns persisted for every contact (other keys of imported rows are dropped)
+CONTACT_FIELDS = ['name', 'email', 'company', 'position', 'source', 'language', 'custom_message', 'date_added']
+
+# Position of date_added in CONTACT_FIELDS
+DATE_COLUMN = CONTACT_FIELDS.index('date_added')
+
+# Rows written per transaction by add_many
+BATCH_SIZE = 5000
+
+# Keys per "IN (...)" lookup, below SQLite's bound-parameter limit
+LOOKUP_SIZE = 500
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {', '.join(f'{field} TEXT' for field in CONTACT_FIELDS)},
+    email_key TEXT,
+    name_company_key TEXT,
+    search_text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email_key);
+CREATE INDEX IF NOT EXISTS idx_contacts_name_company ON contacts (name_company_key);
+CREATE INDEX IF NOT EXISTS idx_contacts_company ON contacts (company);
+CREATE INDEX IF NOT EXISTS idx_contacts_date_added ON contacts (date_added);
+"""
+
+SELECT_CONTACTS = f"SELECT id, {', '.join(CONTACT_FIELDS)} FROM contacts"
+INSERT_CONTACT = (
+    f"INSERT INTO contacts ({', '.join(CONTACT_FIELDS)}, email_key, name_company_key, search_text) "
+    f"VALUES ({', '.join('?' * (len(CONTACT_FIELDS) + 3))})"
+)
+UPDATE_CONTACT = (
+    f"UPDATE contacts SET {', '.join(f'{field} = ?' for field in CONTACT_FIELDS)}, "
+    f"email_key = ?, name_company_key = ?, search_text = ? WHERE id = ?"
+)
+
+
+def sql_value(value):
+    """Convert a contact value to something SQLite stores (None for missing)"""
+    if value is None or value != value:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def row_key(name, company):
+    """name_company_key() flattened into a single indexable string"""
+    key = name_company_key(name, company)
+    return SEPARATOR.join(key) if key is not None else None
+
+
+def row_values(contact):
+    """Column values (including derived keys) for INSERT/UPDATE"""
+    values = [sql_value(contact.get(field)) for field in CONTACT_FIELDS]
+    # date_added may arrive as an epoch (see contact_record.now_epoch): store it as text like the rest
+    values[DATE_COLUMN] = format_epoch(values[DATE_COLUMN])
+    return values + [
+        email_key(contact.get('email')),
+        row_key(contact.get('name'), contact.get('company')),
+        SEPARATOR.join(searchable_texts(contact)),
+    ]
+
+
+def merge_into(existing, contact):
+    """Fill the empty fields of existing from contact"""
+    for field, value in contact.items():
+        if field != 'id' and is_empty(existing.get(field)) and not is_empty(value):
+            existing[field] = value
+
+
+class SQLiteContactStore:
+    """ContactStore backed by an SQLite database file
+
+    Same interface as ContactStore, so the generator, imports and exports
+    work unchanged on top of it. The database runs in WAL mode so several
+    sessions can read while one writes; add_many() inserts in batches with
+    executemany() inside one transaction per batch. Duplicate detection,
+    search and iteration are SQL queries on indexed columns holding the
+    normalized email, the normalized (name, company) pair and the lowercased
+    searchable text.
+    """
+
+    def __init__(self, path, on_duplicate='merge', contacts=None):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        if contacts:
+            self.add_many(contacts, on_duplicate=on_duplicate)
+
+    @property
+    def version(self):
+        """Changes by this connection plus commits by other connections"""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return self._conn.total_changes, data_version
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def __iter__(self):
+        cursor = self._conn.execute(f"{SELECT_CONTACTS} ORDER BY id")
+        return (dict(row) for row in cursor)
+
+    def __contains__(self, contact_id):
+        return self._conn.execute("SELECT 1 FROM contacts WHERE id = ?", (contact_id,)).fetchone() is not None
+
+    def _select_one(self, where, params):
+        row = self._conn.execute(f"{SELECT_CONTACTS} WHERE {where} ORDER BY id LIMIT 1", params).fetchone()
+        return dict(row) if row is not None else None
+
+    def get(self, contact_id):
+        """Return the contact with this ID, or None"""
+        return self._select_one("id = ?", (contact_id,))
+
+    def find_by_email(self, email):
+        """Return the contact with this email (case-insensitive), or None"""
+        key = email_key(email)
+        return self._select_one("email_key = ?", (key,)) if key is not None else None
+
+    def find(self, name, company):
+        """Return the contact with this name at this company, or None"""
+        key = row_key(name, company)
+        return self._select_one("name_company_key = ?", (key,)) if key is not None else None
+
+    def find_duplicate(self, contact):
+        """Return the stored contact matching this one by email or by name and company"""
+        return self.find_by_email(contact.get('email')) or self.find(contact.get('name'), contact.get('company'))
+
+    def search(self, query=""):
+        """Contacts whose name, company or email contains query (case-insensitive)"""
+        if not query:
+            return list(self)
+        query = query.lower()
+        if SEPARATOR in query:
+            return []
+        cursor = self._conn.execute(
+            f"{SELECT_CONTACTS} WHERE instr(search_text, ?) > 0 ORDER BY id", (query,)
+        )
+        return [dict(row) for row in cursor]
+
+    def add(self, contact, on_duplicate='reject'):
+        """Insert a contact and return the stored copy (see ContactStore.add)"""
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"on_duplicate must be one of {DUPLICATE_POLICIES}, got '{on_duplicate}'")
+
+        with self._conn:
+            existing = self.find_duplicate(contact)
+            if existing is not None:
+                if on_duplicate == 'reject':
+                    raise DuplicateContactError(existing)
+                if on_duplicate == 'merge':
+                    merge_into(existing, contact)
+                    self._conn.execute(UPDATE_CONTACT, row_values(existing) + [existing['id']])
+                return existing
+
+            cursor = self._conn.execute(INSERT_CONTACT, row_values(contact))
+        return self.get(cursor.lastrowid)
+
+    def add_many(self, contacts, on_duplicate='merge'):
+        """Insert several contacts in batched transactions, returning (added, duplicates)"""
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"on_duplicate must be one of {DUPLICATE_POLICIES}, got '{on_duplicate}'")
+
+        added = duplicates = 0
+        batch = []
+        for contact in contacts:
+            batch.append(contact)
+            if len(batch) == BATCH_SIZE:
+                batch_added, batch_duplicates = self._add_batch(batch, on_duplicate)
+                added += batch_added
+                duplicates += batch_duplicates
+                batch = []
+        if batch:
+            batch_added, batch_duplicates = self._add_batch(batch, on_duplicate)
+            added += batch_added
+            duplicates += batch_duplicates
+        return added, duplicates
+
+    def _lookup(self, column, keys):
+        """Map existing values of an indexed key column to the lowest contact ID"""
+        keys = [key for key in keys if key is not None]
+        found = {}
+        for start in range(0, len(keys), LOOKUP_SIZE):
+            chunk = keys[start:start + LOOKUP_SIZE]
+            cursor = self._conn.execute(
+                f"SELECT {column}, MIN(id) FROM contacts WHERE {column} IN ({', '.join('?' * len(chunk))}) "
+                f"GROUP BY {column}",
+                chunk,
+            )
+            found.update(cursor.fetchall())
+        return found
+
+    def _add_batch(self, batch, on_duplicate):
+        """Insert one batch in a single transaction, resolving duplicates in memory"""
+        keyed = [
+            (contact, email_key(contact.get('email')), row_key(contact.get('name'), contact.get('company')))
+            for contact in batch
+        ]
+        with self._conn:
+            stored_by_email = self._lookup('email_key', {ek for _, ek, _ in keyed})
+            stored_by_name = self._lookup('name_company_key', {nk for _, _, nk in keyed})
+
+            new_contacts = []
+            new_by_email = {}
+            new_by_name = {}
+            merged = {}
+            duplicates = 0
+            for contact, ek, nk in keyed:
+                existing_id = stored_by_email.get(ek) or stored_by_name.get(nk)
+                if existing_id is not None:
+                    duplicates += 1
+                    if on_duplicate == 'reject':
+                        raise DuplicateContactError(self.get(existing_id))
+                    if on_duplicate == 'merge':
+                        if existing_id not in merged:
+                            merged[existing_id] = self.get(existing_id)
+                        merge_into(merged[existing_id], contact)
+                    continue
+
+                position = new_by_email.get(ek)
+                if position is None:
+                    position = new_by_name.get(nk)
+                if position is not None:
+                    # Duplicate of a row earlier in this same batch
+                    duplicates += 1
+                    if on_duplicate == 'reject':
+                        raise DuplicateContactError(new_contacts[position])
+                    if on_duplicate == 'merge':
+                        merge_into(new_contacts[position], contact)
+                    continue
+
+                new_contacts.append(dict(contact))
+                if ek is not None:
+                    new_by_email[ek] = len(new_contacts) - 1
+                if nk is not None:
+                    new_by_name[nk] = len(new_contacts) - 1
+
+            self._conn.executemany(INSERT_CONTACT, (row_values(contact) for contact in new_contacts))
+            self._conn.executemany(
+                UPDATE_CONTACT, (row_values(contact) + [contact['id']] for contact in merged.values())
+            )
+        return len(new_contacts), duplicates
+
+    def remove(self, contact_id):
+        """Delete a contact by ID and return it"""
+        contact = self.get(contact_id)
+        if contact is None:
+            raise KeyError(contact_id)
+        with self._conn:
+            self._conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+        return contact
+
+    def remove_many(self, contact_ids):
+        """Delete several contacts by ID in one transaction, returning how many were removed"""
+        before = self._conn.total_changes
+        with self._conn:
+            self._conn.executemany("DELETE FROM contacts WHERE id = ?", ((int(i),) for i in contact_ids))
+        return self._conn.total_changes - before
+
+    def clear(self):
+        """Delete every contact (IDs are not reused)"""
+        with self._conn:
+            self._conn.execute("DELETE FROM contacts")
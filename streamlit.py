@@ -1,8 +1,21 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import re
-import io
+import os
+import time
+import uuid
+
+from company_registry import RegistryError
+from contact_export import DOWNLOAD_COLUMNS, ExportCache
+from contact_import import import_contacts, iter_chunks
+from contact_record import now_epoch
+from contact_store import ContactStore
+from contact_validation import ContactValidator
+from contact_view import DISPLAY_COLUMNS, ContactsView
+from format_inference import infer_formats
+from main import ProfessionalEmailGenerator
+from metrics import Metrics, count_error, disable, enable, instrumented
+from sqlite_store import SQLiteContactStore
 
 # Set page config
 st.set_page_config(
@@ -12,121 +25,78 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-class ProfessionalEmailGenerator:
-    def __init__(self):
-        # Same company formats as before
-        self.company_formats = {
-            # Investment Banks
-            "Goldman Sachs": "{f}.{l}@gs.com",
-            "JPMorgan": "{f}.{l}@jpmorgan.com",
-            "Morgan Stanley": "{f}.{l}@morganstanley.com",
-            "Credit Suisse": "{f}.{l}@credit-suisse.com",
-            "UBS": "{f}.{l}@ubs.com",
-            "Citigroup": "{f}.{l}@citi.com",
-            "Deutsche Bank": "{f}.{l}@db.com",
-            "Barclays": "{f}.{l}@barclays.com",
-            "HSBC": "{f}.{l}@hsbc.com",
-            "Jefferies": "{fi}{l}@jefferies.com",
-            "Lazard": "{f}.{l}@lazard.com",
-            "RBC Capital Markets": "{f}.{l}@rbccm.com",
-            "Rothschild & Co": "{f}.{l}@rothschildandco.com",
-            "Standard Chartered": "{f}.{l}@sc.com",
-            
-            # French Banks
-            "BNP Paribas": "{f}.{l}@bnpparibas.com",
-            "BNP Paribas UK": "{f}.{l}@uk.bnpparibas.com",
-            "Crédit Agricole CIB": "{f}.{l}@ca-cib.com",
-            "Société Générale CIB": "{f}.{l}@sgcib.com",
-            "Natixis": "{f}.{l}@natixis.com",
-            "BPCE": "{f}.{l}@bpce.com",
-            "Crédit Mutuel": "{f}.{l}@creditmutuel.fr",
-            
-            # Hedge Funds & Asset Management
-            "Blackstone": "{f}.{l}@blackstone.com",
-            "KKR": "{f}.{l}@kkr.com",
-            "Apollo": "{f}.{l}@apollo.com",
-            "Carlyle": "{f}.{l}@carlyle.com",
-            "Bridgewater": "{f}.{l}@bridgewater.com",
-            "Two Sigma": "{f}.{l}@twosigma.com",
-            "Citadel": "{f}.{l}@citadel.com",
-            "Marshall Wace": "{f}.{l}@marshallwace.com",
-            "Man Group": "{f}.{l}@man.com",
-            "Odey Asset Management": "{f}.{l}@odey.com",
-            
-            # French Asset Management
-            "Amundi": "{f}.{l}@amundi.com",
-            "AXA Investment Managers": "{f}.{l}@axa-im.com",
-            "Lyxor": "{f}.{l}@lyxor.com",
-            "Carmignac": "{f}.{l}@carmignac.com",
-            "Tikehau Capital": "{f}.{l}@tikehaucapital.com",
-            
-            # Consulting
-            "McKinsey": "{f}_{l}@mckinsey.com",
-            "BCG": "{f}.{l}@bcg.com",
-            "Bain": "{f}.{l}@bain.com",
-            "Oliver Wyman": "{f}.{l}@oliverwyman.com",
-            "Roland Berger": "{f}.{l}@rolandberger.com",
-            
-            # Big 4
-            "Deloitte": "{f}{l}@deloitte.fr",
-            "PwC": "{f}.{l}@pwc.com",
-            "KPMG": "{f}{l}@kpmg.fr",
-            "EY": "{f}.{l}@ey.com",
-            
-            # Private Equity
-            "Advent International": "{f}.{l}@adventinternational.com",
-            "Apax Partners": "{f}.{l}@apax.com",
-            "CVC Capital": "{f}.{l}@cvc.com",
-            "Permira": "{f}.{l}@permira.com",
-            "PAI Partners": "{f}.{l}@paipartners.com",
-            "Eurazeo": "{f}.{l}@eurazeo.com",
-        }
-        
-        self.categories = {
-            "Investment Banks": ["Goldman Sachs", "JPMorgan", "Morgan Stanley", "Credit Suisse", "UBS", "Citigroup", "Deutsche Bank", "Barclays", "HSBC", "Jefferies", "Lazard", "RBC Capital Markets", "Rothschild & Co", "Standard Chartered"],
-            "French Banks": ["BNP Paribas", "BNP Paribas UK", "Crédit Agricole CIB", "Société Générale CIB", "Natixis", "BPCE", "Crédit Mutuel"],
-            "Hedge Funds & Asset Management": ["Blackstone", "KKR", "Apollo", "Carlyle", "Bridgewater", "Two Sigma", "Citadel", "Marshall Wace", "Man Group", "Odey Asset Management"],
-            "French Asset Management": ["Amundi", "AXA Investment Managers", "Lyxor", "Carmignac", "Tikehau Capital"],
-            "Consulting": ["McKinsey", "BCG", "Bain", "Oliver Wyman", "Roland Berger"],
-            "Big 4": ["Deloitte", "PwC", "KPMG", "EY"],
-            "Private Equity": ["Advent International", "Apax Partners", "CVC Capital", "Permira", "PAI Partners", "Eurazeo"]
-        }
-    
-    def clean_name(self, name):
-        """Clean and format names"""
-        name = re.sub(r'\s+', ' ', name.strip().lower())
-        name = re.sub(r"[^\w\s\-']", '', name)
-        return name
-    
-    def generate_email(self, first_name, last_name, company):
-        """Generate email based on company format"""
-        if company not in self.company_formats:
-            raise ValueError(f"Company '{company}' not found in database")
-        
-        first_clean = self.clean_name(first_name)
-        last_clean = self.clean_name(last_name)
-        
-        format_pattern = self.company_formats[company]
-        
-        email = format_pattern.format(
-            f=first_clean,
-            l=last_clean,
-            fi=first_clean[0] if first_clean else '',
-            li=last_clean[0] if last_clean else ''
-        )
-        
-        return email
-
 # Initialize the generator
 @st.cache_resource
 def get_generator():
     return ProfessionalEmailGenerator()
 
 generator = get_generator()
+# Edits to companies.json show up on the next rerun; an invalid edit is
+# refused and reported to every session until the file is fixed
+try:
+    generator.reload_registry()
+except RegistryError:
+    pass
+if generator.registry.error:
+    st.warning(f"⚠️ companies.json was not reloaded, the previous version is still in use: {generator.registry.error}")
+# The generator is shared by every session: this rerun reads one registry
+# version throughout, even if another session adds a company meanwhile
+registry = generator.registry.snapshot
+
+# Column headers of the contacts table
+COLUMN_LABELS = {
+    'name': "Name",
+    'email': "Email",
+    'language': "Language",
+    'company': "Company",
+    'position': "Position",
+    'source': "Source",
+    'custom_message': "Custom Message",
+    'date_added': "Date Added",
+}
+
+# Rows per page offered on the View Contacts page
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 50
+
+# Search results are cached on (store_key, version): the store itself is not
+# hashed (leading underscore), and a rerun without changes reuses them
+@st.cache_data(max_entries=32, show_spinner=False)
+@instrumented('search_contacts')
+def search_ids(_store, store_key, version, query):
+    """IDs of the contacts matching a search query"""
+    return [contact['id'] for contact in _store.search(query)]
+
+def contact_labels(df):
+    """'Name (Company) · email' label of each contact of a frame, by ID"""
+    labels = df['name'].astype(str) + ' (' + df['company'].astype(str) + ') · ' + df['email'].astype(str)
+    return dict(zip(df.index.tolist(), labels))
 
 # Initialize session state for contacts
 if 'contacts' not in st.session_state:
-    st.session_state.contacts = []
+    # Set CONTACTS_DB to an SQLite file to persist contacts and share them between sessions
+    if os.environ.get('CONTACTS_DB'):
+        st.session_state.contacts = SQLiteContactStore(os.environ['CONTACTS_DB'])
+    else:
+        st.session_state.contacts = ContactStore()
+if 'store_key' not in st.session_state:
+    # Identifies this session's store in the view caches, which all sessions share
+    st.session_state.store_key = uuid.uuid4().hex
+if st.session_state.get('contacts_view') is None or st.session_state.contacts_view.store is not st.session_state.contacts:
+    # This session's table: frame and sort orders, updated in place as contacts change
+    st.session_state.contacts_view = ContactsView(st.session_state.contacts)
+if 'export_cache' not in st.session_state:
+    st.session_state.export_cache = ExportCache()
+
+# Opt-in instrumentation for this session, toggled on the Diagnostics page
+if 'metrics' not in st.session_state:
+    st.session_state.metrics = Metrics()
+    st.session_state.metrics_enabled = bool(os.environ.get('MAILGEN_METRICS'))
+if st.session_state.metrics_enabled:
+    enable(st.session_state.metrics)
+else:
+    disable()
+rerun_started = time.perf_counter()
 
 # Header
 st.title("📧 Professional Email Generator")
@@ -136,7 +106,7 @@ st.markdown("---")
 st.sidebar.title("🚀 Navigation")
 page = st.sidebar.selectbox(
     "Choose a page:",
-    ["Add Contact", "View Contacts", "Company Database", "Export/Import"]
+    ["Add Contact", "View Contacts", "Company Database", "Export/Import", "Diagnostics"]
 )
 
 # PAGE 1: ADD CONTACT
@@ -151,8 +121,8 @@ if page == "Add Contact":
         
         # Company selection with categories
         st.subheader("Select Company")
-        category = st.selectbox("Category:", list(generator.categories.keys()))
-        company = st.selectbox("Company:", generator.categories[category])
+        category = st.selectbox("Category:", list(registry.categories.keys()))
+        company = st.selectbox("Company:", registry.categories[category])
         
     with col2:
         position = st.text_input("Position", placeholder="Analyst")
@@ -182,16 +152,17 @@ if page == "Add Contact":
                     'source': source,
                     'language': language,
                     'custom_message': custom_message,
-                    'date_added': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'date_added': now_epoch()
                 }
                 
-                st.session_state.contacts.append(contact)
+                contact = st.session_state.contacts.add(contact)
                 st.success(f"✅ Contact added: {contact['name']} - {contact['email']}")
                 
                 # Clear form
                 st.rerun()
                 
             except Exception as e:
+                count_error('add_contact', e)
                 st.error(f"❌ Error: {e}")
         else:
             st.error("❌ Please fill in all required fields (First Name, Last Name, Company)")
@@ -210,64 +181,86 @@ elif page == "View Contacts":
             clear_search = st.button("Clear")
         
         # Filter contacts based on search
-        contacts_to_show = st.session_state.contacts
-        if search_query:
-            query = search_query.lower()
-            contacts_to_show = [
-                contact for contact in st.session_state.contacts
-                if (query in contact['name'].lower() or 
-                    query in contact['company'].lower() or 
-                    query in contact['email'].lower())
-            ]
-        
-        # Display contacts count
-        st.info(f"📊 Showing {len(contacts_to_show)} of {len(st.session_state.contacts)} contacts")
+        store = st.session_state.contacts
+        view_key = (store, st.session_state.store_key, store.version)
+        ids_to_show = search_ids(*view_key, search_query)
         
         # Display contacts in a table
-        if contacts_to_show:
-            df = pd.DataFrame(contacts_to_show)
-            # Reorder columns to match your CSV structure
-            column_order = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message', 'date_added']
-            # Only include columns that exist in the data
-            available_columns = [col for col in column_order if col in df.columns]
-            df = df[available_columns]
+        if ids_to_show:
+            # Sorting and paging happen here: only the visible page is sent to the browser
+            col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+            with col1:
+                sort_column = st.selectbox("Sort by:", DISPLAY_COLUMNS, index=DISPLAY_COLUMNS.index('date_added'),
+                                           format_func=COLUMN_LABELS.__getitem__)
+            with col2:
+                direction = st.radio("Order:", ["Descending", "Ascending"], horizontal=True)
+            with col3:
+                page_size = st.selectbox("Rows per page:", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
+            
+            view = st.session_state.contacts_view
+            df = view.refresh()
+            order = view.order(sort_column, direction == "Descending", search_query, ids_to_show)
+            pages = max(1, -(-len(order) // page_size))
+            if st.session_state.get('contacts_page', 1) > pages:
+                st.session_state.contacts_page = pages
+            with col4:
+                page_number = st.number_input("Page:", min_value=1, max_value=pages, step=1, key='contacts_page')
+            
+            start = (page_number - 1) * page_size
+            page_df = df.loc[order[start:start + page_size]]
+            
+            st.info(f"📊 Showing {start + 1}–{start + len(page_df)} of {len(order)} matching contacts "
+                    f"({len(store)} in total) · page {page_number} of {pages}")
             
             st.dataframe(
-                df,
+                page_df,
                 use_container_width=True,
                 hide_index=True,
                 column_config={
-                    "name": "Name",
-                    "email": "Email",
-                    "language": "Language",
-                    "company": "Company",
-                    "position": "Position",
-                    "source": "Source",
+                    "name": COLUMN_LABELS['name'],
+                    "email": COLUMN_LABELS['email'],
+                    "language": COLUMN_LABELS['language'],
+                    "company": COLUMN_LABELS['company'],
+                    "position": COLUMN_LABELS['position'],
+                    "source": COLUMN_LABELS['source'],
                     "custom_message": st.column_config.TextColumn(
-                        "Custom Message",
+                        COLUMN_LABELS['custom_message'],
                         width="large"
                     ),
                     "date_added": st.column_config.DatetimeColumn(
-                        "Date Added",
+                        COLUMN_LABELS['date_added'],
                         format="DD/MM/YYYY HH:mm"
                     )
                 }
             )
             
-            # Delete contacts section
-            st.subheader("🗑️ Delete Contact")
-            contact_names = [f"{contact['name']} ({contact['company']})" for contact in contacts_to_show]
-            if contact_names:
-                contact_to_delete = st.selectbox("Select contact to delete:", [""] + contact_names)
+            # Delete contacts section (options are contact IDs, so namesakes stay distinct)
+            st.subheader("🗑️ Delete Contacts")
+            labels = contact_labels(page_df)
+            ids_to_delete = st.multiselect(
+                "Select contacts on this page to delete:", list(labels), format_func=labels.__getitem__
+            )
+            
+            if ids_to_delete and st.button(f"🗑️ Delete {len(ids_to_delete)} Contact(s)", type="secondary"):
+                removed = store.remove_many(ids_to_delete)
+                st.success(f"✅ Deleted {removed} contact(s)")
+                st.rerun()
+            
+            # Bulk delete every shown contact with a given source, company or language
+            with st.expander("🧹 Delete by filter"):
+                field = st.selectbox("Field:", ['source', 'company', 'language'], format_func=str.capitalize)
+                if search_query:
+                    df = df.loc[order]
+                values = sorted(map(str, df[field].dropna().unique()))
+                value = st.selectbox("Value:", values, index=None, format_func=lambda v: v or "(empty)")
                 
-                if contact_to_delete and st.button("🗑️ Delete Contact", type="secondary"):
-                    # Find and remove the contact
-                    for i, contact in enumerate(st.session_state.contacts):
-                        if f"{contact['name']} ({contact['company']})" == contact_to_delete:
-                            deleted_contact = st.session_state.contacts.pop(i)
-                            st.success(f"✅ Deleted: {deleted_contact['name']}")
-                            st.rerun()
-                            break
+                if value is not None:
+                    matching = df.index[(df[field] == value).to_numpy()]
+                    st.warning(f"⚠️ {len(matching)} contact(s) with {field} '{value}' will be deleted.")
+                    if st.button("🗑️ Delete Matching Contacts", type="secondary"):
+                        removed = store.remove_many(matching.tolist())
+                        st.success(f"✅ Deleted {removed} contact(s)")
+                        st.rerun()
         else:
             st.warning("No contacts match your search criteria.")
     
@@ -279,14 +272,14 @@ elif page == "Company Database":
     st.header("🏢 Company Database")
     
     # Display companies by category
-    for category, companies in generator.categories.items():
+    for category, companies in registry.categories.items():
         with st.expander(f"📂 {category} ({len(companies)} companies)"):
             cols = st.columns(2)
             for i, company in enumerate(companies):
                 col_idx = i % 2
                 with cols[col_idx]:
                     # Show email format
-                    format_pattern = generator.company_formats[company]
+                    format_pattern = registry.formats[company]
                     st.write(f"**{company}**")
                     st.code(format_pattern, language=None)
     
@@ -296,15 +289,29 @@ elif page == "Company Database":
         col1, col2 = st.columns(2)
         with col1:
             new_company = st.text_input("Company Name")
-            new_category = st.selectbox("Category", list(generator.categories.keys()))
+            new_category = st.selectbox("Category", list(registry.categories.keys()))
         with col2:
             new_format = st.text_input("Email Format", placeholder="{f}.{l}@company.com")
             st.help("Use {f} for first name, {l} for last name, {fi} for first initial, {li} for last initial")
         
         if st.button("Add Company") and new_company and new_format:
-            generator.company_formats[new_company] = new_format
-            generator.categories[new_category].append(new_company)
-            st.success(f"✅ Added {new_company} to {new_category}")
+            try:
+                generator.add_company(new_company, new_format, new_category)
+                st.success(f"✅ Added {new_company} to {new_category}")
+            except (ValueError, OSError) as e:
+                st.error(f"❌ {e}")
+    
+    # Formats mined from known addresses
+    st.subheader("🔎 Suggested Formats")
+    with st.expander("Infer formats from imported contacts"):
+        min_support = st.number_input("Minimum matching contacts", min_value=1, value=3)
+        if st.button("Infer Formats"):
+            suggestions = infer_formats(st.session_state.contacts, min_support=min_support)
+            if suggestions.empty:
+                st.info("No format could be inferred from the current contacts.")
+            else:
+                suggestions['registered'] = suggestions['company'].map(registry.formats)
+                st.dataframe(suggestions, use_container_width=True, hide_index=True)
 
 # PAGE 4: EXPORT/IMPORT
 elif page == "Export/Import":
@@ -318,19 +325,8 @@ elif page == "Export/Import":
         with col1:
             # Download as Excel
             if st.button("📊 Download as Excel", type="primary"):
-                df = pd.DataFrame(st.session_state.contacts)
-                # Column order to match your CSV structure exactly
-                column_order = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message']
-                # Only include columns that exist in the data
-                available_columns = [col for col in column_order if col in df.columns]
-                df = df[available_columns]
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, sheet_name='Contacts', index=False)
-                
-                excel_data = output.getvalue()
+                # Column order to match your CSV structure exactly; cached until contacts change
+                excel_data = st.session_state.export_cache.get(st.session_state.contacts, 'xlsx', DOWNLOAD_COLUMNS)
                 
                 st.download_button(
                     label="📥 Download Excel File",
@@ -342,14 +338,7 @@ elif page == "Export/Import":
         with col2:
             # Download as CSV
             if st.button("📋 Download as CSV"):
-                df = pd.DataFrame(st.session_state.contacts)
-                # Column order to match your CSV structure exactly
-                column_order = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message']
-                # Only include columns that exist in the data
-                available_columns = [col for col in column_order if col in df.columns]
-                df = df[available_columns]
-                
-                csv_data = df.to_csv(index=False)
+                csv_data = st.session_state.export_cache.get(st.session_state.contacts, 'csv', DOWNLOAD_COLUMNS)
                 
                 st.download_button(
                     label="📥 Download CSV File",
@@ -372,35 +361,57 @@ elif page == "Export/Import":
     
     if uploaded_file is not None:
         try:
-            if uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file)
-            else:
-                df = pd.read_csv(uploaded_file)
+            # Only the first rows are parsed for the preview
+            preview = next(iter(iter_chunks(uploaded_file, uploaded_file.name, chunk_size=5)), pd.DataFrame())
+            uploaded_file.seek(0)
             
             st.write("📋 Preview of imported data:")
-            st.dataframe(df.head())
+            st.dataframe(preview)
             
             if st.button("✅ Import Contacts", type="primary"):
-                imported_contacts = df.to_dict('records')
+                progress_text = st.empty()
+                rejected_chunks = []
                 
-                # Add to existing contacts
-                for contact in imported_contacts:
-                    # Ensure all required fields exist
-                    required_fields = ['name', 'email', 'language', 'company', 'position', 'source', 'custom_message']
-                    for field in required_fields:
-                        if field not in contact:
-                            contact[field] = ""
-                    
-                    if 'date_added' not in contact:
-                        contact['date_added'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                def report(rows_read, added, duplicates):
+                    rejected = sum(len(chunk) for chunk in rejected_chunks)
+                    progress_text.text(f"⏳ {rows_read:,} rows read ({added:,} added, "
+                                       f"{duplicates:,} duplicates merged, {rejected:,} rejected)")
                 
-                st.session_state.contacts.extend(imported_contacts)
-                st.success(f"✅ Successfully imported {len(imported_contacts)} contacts!")
+                # Stream the file in chunks: each one is validated and inserted before the next is read
+                added, duplicates = import_contacts(
+                    st.session_state.contacts, uploaded_file, filename=uploaded_file.name,
+                    on_duplicate='merge', progress=report,
+                    validator=ContactValidator(registry.formats), on_reject=rejected_chunks.append
+                )
+                if rejected_chunks:
+                    # Kept for the report below, which survives the rerun
+                    st.session_state.import_rejects = pd.concat(rejected_chunks)
+                else:
+                    st.session_state.pop('import_rejects', None)
+                st.success(f"✅ Successfully imported {added} contacts ({duplicates} duplicates merged)!")
                 st.rerun()
                 
         except Exception as e:
             st.error(f"❌ Error importing file: {e}")
     
+    # Rows rejected by the last import, with the reason of each
+    if 'import_rejects' in st.session_state:
+        rejects = st.session_state.import_rejects
+        st.warning(f"⚠️ {len(rejects)} row(s) of the last import were rejected.")
+        st.dataframe(rejects['reason'].value_counts().rename_axis("Reason").reset_index(name="Rows"), hide_index=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Download Rejected Rows",
+                data=rejects.to_csv(index=False),
+                file_name=f"rejected_rows_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+        with col2:
+            if st.button("Dismiss"):
+                del st.session_state.import_rejects
+                st.rerun()
+    
     # Clear all data
     st.markdown("---")
     st.subheader("🗑️ Clear All Data")
@@ -409,12 +420,64 @@ elif page == "Export/Import":
     if st.button("🗑️ Clear All Contacts", type="secondary"):
         if st.session_state.contacts:
             count = len(st.session_state.contacts)
-            st.session_state.contacts = []
+            st.session_state.contacts.clear()
             st.success(f"✅ Cleared {count} contacts")
             st.rerun()
         else:
             st.info("No contacts to clear")
 
+# PAGE 5: DIAGNOSTICS
+elif page == "Diagnostics":
+    st.header("📈 Diagnostics")
+    
+    def toggle_metrics():
+        st.session_state.metrics_enabled = st.session_state.metrics_toggle
+    
+    st.toggle("Collect metrics for this session", value=st.session_state.metrics_enabled,
+              key='metrics_toggle', on_change=toggle_metrics)
+    
+    metrics = st.session_state.metrics
+    data = metrics.to_dict()
+    if not data['calls']:
+        st.info("📭 No calls recorded yet. Enable metrics and use the app to collect some.")
+    else:
+        summary = pd.DataFrame([
+            {
+                'operation': name,
+                'calls': count,
+                'errors': sum(data['errors'].get(name, {}).values()),
+                'total (s)': data['latency'][name]['sum'],
+                'mean (ms)': 1000 * data['latency'][name]['sum'] / count,
+                'p50 ≤ (ms)': 1000 * metrics.quantile(name, 0.5),
+                'p95 ≤ (ms)': 1000 * metrics.quantile(name, 0.95),
+            }
+            for name, count in sorted(data['calls'].items())
+        ])
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+        
+        if data['errors']:
+            st.subheader("❌ Errors by Type")
+            errors = pd.DataFrame([
+                {'operation': name, 'error': error, 'count': count}
+                for name, types in data['errors'].items() for error, count in types.items()
+            ])
+            st.dataframe(errors, use_container_width=True, hide_index=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("📥 Download JSON", data=metrics.to_json(),
+                               file_name="metrics.json", mime="application/json")
+        with col2:
+            st.download_button("📥 Download Prometheus", data=metrics.to_prometheus(),
+                               file_name="metrics.prom", mime="text/plain")
+        with col3:
+            if st.button("🔄 Reset Metrics"):
+                metrics.reset()
+                st.rerun()
+
 # Footer
 st.markdown("---")
 st.markdown("*Professional Email Generator*")
+
+if st.session_state.metrics_enabled:
+    st.session_state.metrics.observe('streamlit_rerun', time.perf_counter() - rerun_started)
@@ -0,0 +1,32 @@
+import csv
+
+from bulk import run_bulk
+from company_registry import CompanyRegistry
+from main import ProfessionalEmailGenerator
+
+REGISTRY = {'Private Equity': {'KKR': '{f}.{l}@kkr.com'}}
+
+
+def run(tmp_path, text):
+    source, output = tmp_path / 'people.csv', tmp_path / 'emails.csv'
+    source.write_text(text, encoding='utf-8')
+    generator = ProfessionalEmailGenerator(registry=CompanyRegistry.from_data(REGISTRY))
+    run_bulk(source, output, generator, workers=1)
+    with open(output, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_columns_pass_through_unchanged(tmp_path):
+    rows = run(tmp_path, "first_name,last_name,company,zip,n\n"
+                         "Jean,Dupont,KKR,007,1\nMarie,Martin,KKR,0123,\nAnne,Petit,KKR,NA,3\n,Roux,KKR,null,4\n")
+    assert rows == [
+        ['first_name', 'last_name', 'company', 'zip', 'n', 'email'],
+        ['Jean', 'Dupont', 'KKR', '007', '1', 'jean.dupont@kkr.com'],
+        ['Marie', 'Martin', 'KKR', '0123', '', 'marie.martin@kkr.com'],
+        ['Anne', 'Petit', 'KKR', 'NA', '3', 'anne.petit@kkr.com'],
+        ['', 'Roux', 'KKR', 'null', '4', ''],
+    ]
+
+
+def test_header_written_without_rows(tmp_path):
+    assert run(tmp_path, "first_name,last_name,company\n") == [['first_name', 'last_name', 'company', 'email']]
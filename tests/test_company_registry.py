@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+from company_registry import REGISTRY_PATH, CompanyRegistry, RegistryError
+from main import ProfessionalEmailGenerator
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    path = tmp_path / 'companies.json'
+    shutil.copy(REGISTRY_PATH, path)
+    return str(path)
+
+
+def edit(path, change):
+    """Rewrite the registry file behind the registry's back, with a distinct mtime"""
+    stat = os.stat(path)
+    change(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_add_keeps_external_edits(registry_path):
+    registry = CompanyRegistry(registry_path)
+
+    def add_accenture(path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data.setdefault('Consulting', {})['Accenture'] = '{f}.{l}@accenture.com'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    edit(registry_path, add_accenture)
+    registry.add('NewCo', '{f}@newco.com')
+    with open(registry_path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['Consulting']['Accenture'] == '{f}.{l}@accenture.com'
+    assert {'Accenture', 'NewCo'} <= set(registry.formats)
+
+
+def test_add_refuses_to_overwrite_an_invalid_edit(registry_path):
+    registry = CompanyRegistry(registry_path)
+
+    def break_file(path):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('half-finished')
+
+    edit(registry_path, break_file)
+    with pytest.raises(RegistryError):
+        registry.add('NewCo', '{f}@newco.com')
+    assert registry.error
+    with open(registry_path, encoding='utf-8') as f:
+        assert f.read().endswith('half-finished')
+    assert 'NewCo' not in registry.formats
+
+
+def test_concurrent_adds_and_reads(registry_path):
+    """Bounded version of `benchmark.py stress`: readers never see a torn or stale-going-back registry"""
+    generator = ProfessionalEmailGenerator(registry=CompanyRegistry(registry_path))
+    violations = []
+    done = threading.Event()
+
+    def read():
+        last_version = 0
+        try:
+            while not done.is_set():
+                snapshot = generator.registry.snapshot
+                if snapshot.version < last_version:
+                    violations.append(f"version went from {last_version} back to {snapshot.version}")
+                last_version = snapshot.version
+                formats = snapshot.formats
+                if sum(len(companies) for companies in snapshot.categories.values()) != len(formats):
+                    violations.append(f"categories and formats disagree at version {snapshot.version}")
+                for company in [company for company in formats if company.startswith("Stress Co ")][-5:]:
+                    email = generator.generate_email("Jean", "Dupont", company)
+                    if email != f"jean.dupont@stress{company[10:]}.com":
+                        violations.append(f"{company} generated {email}")
+        except Exception as e:
+            violations.append(f"reader raised {type(e).__name__}: {e}")
+
+    def write(first):
+        for i in range(first, first + 15):
+            generator.add_company(f"Stress Co {i}", f"{{f}}.{{l}}@stress{i}.com", "Stress")
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    writers = [threading.Thread(target=write, args=(first,)) for first in (0, 100)]
+    for thread in readers + writers:
+        thread.start()
+    for writer in writers:
+        writer.join()
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert violations == []
+    added = {f"Stress Co {i}" for i in list(range(15)) + list(range(100, 115))}
+    assert added <= set(generator.company_formats)
+    assert CompanyRegistry(registry_path).to_data() == generator.registry.to_data()
@@ -0,0 +1,54 @@
+from company_registry import CompanyRegistry
+from contact_journal import ContactJournal, export_changes
+from contact_store import ContactStore
+from main import ProfessionalEmailGenerator
+
+REGISTRY = {'Investment Banks': {'Goldman Sachs': '{f}.{l}@gs.com'}}
+
+
+def open_generator(path):
+    store = ContactStore(journal=ContactJournal(path))
+    return ProfessionalEmailGenerator(store, CompanyRegistry.from_data(REGISTRY))
+
+
+def test_restart_keeps_blank_fields(tmp_path, capsys):
+    path = tmp_path / 'contacts.ndjson'
+    generator = open_generator(path)
+    added = generator.add_contact('Jean', 'Dupont', 'Goldman Sachs')
+    generator.contacts.journal.close()
+
+    generator = open_generator(path)
+    restored = generator.contacts.get(added['id'])
+    assert dict(restored) == dict(added)
+    assert restored['position'] == restored['source'] == restored['custom_message'] == ''
+
+    generator.display_contacts()
+    assert 'jean.dupont@gs.com' in capsys.readouterr().out
+
+
+def test_restore_fills_fields_missing_from_older_entries(tmp_path):
+    path = tmp_path / 'contacts.ndjson'
+    path.write_text('{"seq": 1, "op": "add", "id": 1, "contact": {"name": "Jean Dupont"}}\n')
+    contact = ContactStore(journal=ContactJournal(path)).get(1)
+    assert contact['name'] == 'Jean Dupont'
+    assert contact['position'] == contact['custom_message'] == ''
+
+
+def test_reimporting_unchanged_rows_changes_nothing(tmp_path):
+    rows = [
+        {'name': f'Person {i}', 'email': f'p{i}@gs.com', 'company': 'Goldman Sachs', 'position': '', 'language': 'fr'}
+        for i in range(20)
+    ]
+    journal = ContactJournal(tmp_path / 'contacts.ndjson')
+    store = ContactStore(journal=journal)
+    assert store.add_many(rows) == (20, 0)
+    version, checkpoint = store.version, journal.last_seq
+
+    assert store.add_many([dict(row) for row in rows]) == (0, 20)
+    assert store.version == version
+    assert journal.last_seq == checkpoint
+    assert export_changes(journal, tmp_path / 'delta.csv', since=checkpoint) == (0, checkpoint)
+
+    # A duplicate that does fill a blank field is still recorded
+    store.add(dict(rows[0], position='VP'), on_duplicate='merge')
+    assert journal.last_seq == checkpoint + 1
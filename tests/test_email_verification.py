@@ -0,0 +1,75 @@
+import asyncio
+
+from email_verification import CATCH_ALL, INVALID, VALID, EmailVerifier
+
+
+class StandInServer:
+    """Local SMTP server that accepts the mailboxes it knows, or any address on catch-all domains"""
+
+    def __init__(self, mailboxes=(), catch_all=()):
+        self.mailboxes = set(mailboxes)
+        self.catch_all = set(catch_all)
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b'220 stand-in ESMTP\r\n')
+        while line := await reader.readline():
+            command = line.decode('ascii').strip()
+            verb = command.split(':')[0].split(' ')[0].upper()
+            if verb == 'EHLO':
+                writer.write(b'250-stand-in\r\n250 SIZE 1000000\r\n')
+            elif verb == 'RCPT':
+                address = command.partition(':')[2].strip('<>')
+                accepted = address in self.mailboxes or address.rpartition('@')[2] in self.catch_all
+                writer.write(b'250 OK\r\n' if accepted else b'550 No such user\r\n')
+            elif verb == 'QUIT':
+                writer.write(b'221 Bye\r\n')
+                break
+            else:
+                writer.write(b'250 OK\r\n')
+            await writer.drain()
+        writer.close()
+
+    def verify(self, emails, **options):
+        async def run():
+            server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            async def resolver(domain):
+                return ['127.0.0.1']
+
+            async with server:
+                verifier = EmailVerifier(resolver=resolver, port=port, sender='check@example.com',
+                                         helo_name='localhost', timeout=5, **options)
+                return await verifier.verify_many(emails)
+
+        return asyncio.run(run())
+
+
+def test_one_connection_per_domain():
+    server = StandInServer(mailboxes={'jean.dupont@gs.com', 'marie.martin@ubs.com'})
+    emails = ['jean.dupont@gs.com', 'jdupont@gs.com', 'marie.martin@ubs.com', 'mmartin@ubs.com']
+    results = server.verify(emails)
+    assert results == {
+        'jean.dupont@gs.com': VALID,
+        'jdupont@gs.com': INVALID,
+        'marie.martin@ubs.com': VALID,
+        'mmartin@ubs.com': INVALID,
+    }
+    assert server.connections == 2
+
+
+def test_catch_all_domain():
+    server = StandInServer(catch_all={'kkr.com'})
+    results = server.verify(['a@kkr.com', 'b@kkr.com', 'c@kkr.com'], per_domain=3)
+    assert set(results.values()) == {CATCH_ALL}
+    assert server.connections == 1
+
+
+def test_per_domain_connections_share_the_addresses():
+    server = StandInServer(mailboxes={f'user{i}@gs.com' for i in range(0, 10, 2)})
+    emails = [f'user{i}@gs.com' for i in range(10)]
+    results = server.verify(emails, per_domain=3)
+    assert results == {email: VALID if i % 2 == 0 else INVALID for i, email in enumerate(emails)}
+    assert server.connections == 3
@@ -0,0 +1,28 @@
+from email import message_from_bytes, policy
+
+from mail_merge import DraftBuilder, compile_templates, render_drafts
+
+TEMPLATES = compile_templates({'en': {'subject': "Hello {company}", 'body': "Hi {first_name},\n"}})
+
+
+def render(contact):
+    builder = DraftBuilder('Zoë Dupont <zoe@x.com>')
+    [(_, _, message, reason)] = render_drafts([contact], TEMPLATES, builder)
+    return message, reason
+
+
+def test_header_injection_in_email_is_rejected():
+    for email in ('e@x.com\rBcc: a@b.com', 'e@x.com\nBcc: a@b.com', 'e@x.com\x00', 'Eve <e@x.com>', 'e@'):
+        message, reason = render({'name': 'Eve Smith', 'email': email, 'company': 'X', 'language': 'en'})
+        assert message is None and reason == "missing or invalid email", email
+
+
+def test_control_characters_are_dropped_from_the_name():
+    message, reason = render(
+        {'name': 'Eve\rBcc: a@b.com Smith', 'email': 'e@x.com', 'company': 'X\r\nBcc: c@d.com', 'language': 'en'}
+    )
+    assert reason is None
+    parsed = message_from_bytes(message, policy=policy.default)
+    assert parsed['Bcc'] is None
+    assert [address.addr_spec for address in parsed['To'].addresses] == ['e@x.com']
+    assert parsed['From'].addresses[0].domain == 'x.com'